@@ -1,8 +1,10 @@
 """amats_project package initializer."""
 
-# Ensure Celery app is loaded when Django starts
-try:
-	from .celery import app as celery_app  # noqa: F401
-except Exception:
-	pass
 
+def __getattr__(name):
+	# Load the Celery app on first access only, so web processes that never
+	# touch Celery skip importing kombu/billiard/redis at startup.
+	if name == 'celery_app':
+		from .celery import app
+		return app
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,59 @@
+"""
+Non-blocking logging for AMATS
+Request threads only enqueue records; one listener thread writes them out.
+"""
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_QUEUE = queue.SimpleQueue()
+
+_listener = None
+
+
+def queue_handler():
+    """dictConfig factory for the handler attached to application loggers"""
+    return QueueHandler(LOG_QUEUE)
+
+
+def _build_handlers():
+    from django.conf import settings
+
+    file_handler = logging.FileHandler(settings.LOG_FILE)
+    console_handler = logging.StreamHandler()
+    for handler in (file_handler, console_handler):
+        handler.setLevel(logging.INFO)
+    return file_handler, console_handler
+
+
+def start_listener(handlers=None):
+    """Start draining LOG_QUEUE into the file and console handlers (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+    _listener = QueueListener(LOG_QUEUE, *(handlers or _build_handlers()), respect_handler_level=True)
+    _listener.start()
+
+
+def stop_listener():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_in_child():
+    # Threads do not survive fork (gunicorn --preload, celery prefork), so
+    # each child starts its own listener over the inherited handlers.
+    global _listener
+    if _listener is not None:
+        handlers = _listener.handlers
+        _listener = None
+        start_listener(handlers)
+
+
+atexit.register(stop_listener)
+os.register_at_fork(after_in_child=_restart_in_child)
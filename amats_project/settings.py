@@ -3,7 +3,9 @@ Django settings for AMATS (Access Management and Asset Tracking System)
 UTV Ghana Cybersecurity Field Study Project
 """
 
+import logging
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -36,8 +38,8 @@ INSTALLED_APPS = [
     'crispy_forms',
     'crispy_bootstrap5',
     'rest_framework',
+    'rest_framework.authtoken',
     'csp',
-    'django_celery_results',
 
     # Local apps
     'asset_management',
@@ -51,6 +53,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'asset_management.middleware.AuditLogBufferMiddleware',
 ]
 
 ROOT_URLCONF = 'amats_project.urls'
@@ -90,8 +93,23 @@ if os.environ.get('POSTGRES_DB'):
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD'),
         'HOST': os.environ.get('POSTGRES_HOST', 'db'),
         'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        # Keep connections open between requests; health checks drop dead ones
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': 5,
+            'keepalives': 1,
+            'keepalives_idle': 30,
+        },
     }
 
+# request.user is loaded with its profile; ModelBackend stays listed so
+# sessions created before the switch remain valid
+AUTHENTICATION_BACKENDS = [
+    'asset_management.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -128,6 +146,11 @@ AUTH_PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
 ]
 
+# Test runs (manage.py test / pytest) hash with MD5 so fixture users are cheap to create
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+if TESTING:
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
@@ -135,7 +158,7 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'asset_management.api.authentication.CachedTokenAuthentication',
     ],
 }
 
@@ -146,6 +169,19 @@ CHANNEL_LAYERS = {
         'BACKEND': 'channels.layers.InMemoryChannelLayer'
     }
 }
+# The in-memory layer is single-process; share a Redis layer across workers
+if os.environ.get('REDIS_URL'):
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': [os.environ['REDIS_URL']],
+                'capacity': 1500,
+                'expiry': 30,
+                'serializer_format': 'msgpack',
+            },
+        }
+    }
 
 # Content Security Policy
 CSP_DEFAULT_SRC = ("'self'",)
@@ -154,14 +190,47 @@ CSP_SCRIPT_SRC = ("'self'", 'https://cdn.jsdelivr.net')
 
 # Celery configuration
 CELERY_BROKER_URL = os.environ.get('REDIS_URL', 'redis://redis:6379/0')
-# Use django-celery-results to store task state/results in the database
-CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'django-db')
+# Store task results next to the broker with a TTL; set CELERY_RESULT_BACKEND=django-db
+# to keep them in the database via django-celery-results instead
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+CELERY_RESULT_EXPIRES = 3600
+if CELERY_RESULT_BACKEND == 'django-db':
+    INSTALLED_APPS.append('django_celery_results')
+# Reuse a bounded pool of Redis sockets for publishing instead of reconnecting per task
+CELERY_BROKER_POOL_LIMIT = 10
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'max_connections': 50,
+    'socket_keepalive': True,
+    'visibility_timeout': 3600,
+}
+CELERY_REDIS_MAX_CONNECTIONS = 20
+CELERY_REDIS_SOCKET_KEEPALIVE = True
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 
-# Periodic tasks (example)
-from celery.schedules import crontab
+# Audit log writes: inline by default; set AUDIT_LOG_ASYNC=True to batch them through
+# Celery (celery-batches flushes every 100 entries or 5 seconds)
+AUDIT_LOG_ASYNC = os.environ.get('AUDIT_LOG_ASYNC', 'False').lower() == 'true'
+if AUDIT_LOG_ASYNC:
+    # Batches needs the worker to prefetch more than flush_every messages
+    CELERY_WORKER_PREFETCH_MULTIPLIER = 0
+# Minimum level (logging level name or number) an audit entry needs to be recorded;
+# resolved to an int here so a typo fails at startup rather than on every audit write
+_audit_log_level = os.environ.get('AUDIT_LOG_LEVEL', 'DEBUG').upper()
+if _audit_log_level.isdigit():
+    AUDIT_LOG_LEVEL = int(_audit_log_level)
+elif _audit_log_level in logging.getLevelNamesMapping():
+    AUDIT_LOG_LEVEL = logging.getLevelNamesMapping()[_audit_log_level]
+else:
+    from django.core.exceptions import ImproperlyConfigured
+    raise ImproperlyConfigured(f'AUDIT_LOG_LEVEL must be a logging level name, got {_audit_log_level!r}')
+# Manual network scans: run in the request by default; set NETWORK_SCAN_ASYNC=True to
+# hand them to a Celery worker and notify the user when the scan finishes
+NETWORK_SCAN_ASYNC = os.environ.get('NETWORK_SCAN_ASYNC', 'False').lower() == 'true'
+
+# Periodic tasks (example). Keep schedules as plain intervals so settings
+# import does not pull in Celery; import crontab in celery.py if one is needed.
 CELERY_BEAT_SCHEDULE = {
     'check-overdue-every-10-minutes': {
         'task': 'asset_management.tasks.check_overdue_assignments',
@@ -169,6 +238,20 @@ CELERY_BEAT_SCHEDULE = {
     },
 }
 
+# Shared cache: Redis when available (pooled connections), per-process memory otherwise
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+            'OPTIONS': {
+                'pool_class': 'redis.BlockingConnectionPool',
+                'max_connections': 100,
+                'timeout': 1.0,
+            },
+        }
+    }
+
 # Email defaults (use env vars in production)
 EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.environ.get('EMAIL_HOST', '')
@@ -205,23 +288,26 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 # Logging Configuration
+# Application loggers push records onto an in-memory queue; the file and
+# console handlers run behind a QueueListener started in AppConfig.ready()
+# (see amats_project/log_queue.py), so request threads never block on I/O.
+LOG_FILE = BASE_DIR / 'logs/amats.log'
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'handlers': {
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'logs/amats.log',
-        },
-        'console': {
-            'level': 'INFO',
-            'class': 'logging.StreamHandler',
+        'queue': {
+            '()': 'amats_project.log_queue.queue_handler',
         },
     },
     'loggers': {
         'asset_management': {
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': True,
+        },
+        'network_scanner': {
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
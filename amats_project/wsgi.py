@@ -2,7 +2,15 @@
 WSGI config for amats_project project.
 """
 import os
+from importlib import import_module
+
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'amats_project.settings')
 application = get_wsgi_application()
+
+# Import the URLconf (and with it every view/serializer module) at load time so
+# the first request doesn't pay for it; under gunicorn --preload this happens
+# once in the master and is shared by the forked workers.
+import_module(settings.ROOT_URLCONF)
@@ -2,9 +2,19 @@
 AMATS Admin Configuration
 """
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Count
 from .models import Asset, AssetCategory, AssetAssignment, UserProfile, AuditLog, MaintenanceRecord
 
 
+class ColumnLimitedChangeList(ChangeList):
+    """ChangeList that loads only the ModelAdmin's changelist_fields for its rows"""
+
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        return queryset.only(*self.model_admin.changelist_fields)
+
+
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'role', 'department', 'employee_id', 'phone']
@@ -20,8 +30,12 @@ class AssetCategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'asset_count', 'created_at']
     search_fields = ['name']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_asset_count=Count('assets'))
+
     def asset_count(self, obj):
-        return obj.assets.count()
+        return obj._asset_count
+    asset_count.admin_order_field = '_asset_count'
 
 
 @admin.register(Asset)
@@ -53,9 +67,19 @@ class AssetAdmin(admin.ModelAdmin):
         }),
     )
 
+    # Columns needed to render the changelist rows
+    changelist_fields = (
+        'asset_tag', 'name', 'status', 'condition', 'location', 'network_last_seen',
+        'category__name', 'assigned_to__username',
+    )
+
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('category', 'assigned_to')
 
+    def get_changelist(self, request, **kwargs):
+        # Only the list page is narrowed; change/delete views need every column
+        return ColumnLimitedChangeList
+
 
 @admin.register(AssetAssignment)
 class AssetAssignmentAdmin(admin.ModelAdmin):
@@ -69,11 +93,13 @@ class AssetAssignmentAdmin(admin.ModelAdmin):
     date_hierarchy = 'date_out'
 
     def is_overdue(self, obj):
-        return obj.is_overdue()
+        return obj.overdue
     is_overdue.boolean = True
+    is_overdue.admin_order_field = 'overdue'
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('asset', 'assigned_to', 'assigned_by')
+        # Compute the overdue flag in SQL so the column can be sorted
+        return super().get_queryset(request).select_related('asset', 'assigned_to', 'assigned_by').with_overdue()
 
 
 @admin.register(AuditLog)
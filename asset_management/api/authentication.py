@@ -0,0 +1,60 @@
+"""
+AMATS API authentication
+Token authentication that caches the token -> user id lookup
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+TOKEN_CACHE_TIMEOUT = 60
+
+
+def _cache_key(key):
+    return f'authtoken:{key}'
+
+
+def _cache_is_shared():
+    # LocMem is per process: another worker's post_delete invalidation never
+    # reaches it, so a revoked token would keep working there until it expired
+    return not isinstance(caches['default'], LocMemCache)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that remembers which user a token belongs to for
+    TOKEN_CACHE_TIMEOUT seconds. The user row is still loaded on every request
+    so deactivated accounts are rejected immediately.
+
+    The cache is only used when the default cache is shared between processes
+    (e.g. Redis); with the per-process LocMem cache every request hits the
+    token table. request.auth is the token key string on every path.
+    """
+
+    def authenticate_credentials(self, key):
+        if not _cache_is_shared():
+            user, token = super().authenticate_credentials(key)
+            return (user, token.key)
+
+        user_id = cache.get(_cache_key(key))
+        if user_id is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(_cache_key(key), user.pk, TOKEN_CACHE_TIMEOUT)
+            return (user, token.key)
+
+        user = User.objects.filter(pk=user_id).only(
+            'id', 'username', 'is_active', 'is_staff', 'is_superuser'
+        ).first()
+        if user is None or not user.is_active:
+            cache.delete(_cache_key(key))
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return (user, key)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    cache.delete(_cache_key(instance.key))
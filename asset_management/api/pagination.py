@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class AssetCursorPagination(CursorPagination):
+    """Seek-based pages for assets; avoids COUNT(*) and deep OFFSET scans."""
+    ordering = '-id'
+    page_size = 50
+
+
+class AssetAssignmentCursorPagination(CursorPagination):
+    ordering = '-id'
+    page_size = 50
+
+
+class AuditLogCursorPagination(CursorPagination):
+    """Audit trail pages walk the timestamp index newest first."""
+    ordering = '-timestamp'
+    page_size = 50
@@ -1,9 +1,44 @@
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from ..audit import LazyAudit, record_audit
 from ..models import Asset, AssetCategory, AssetAssignment, AuditLog, MaintenanceRecord
 from django.contrib.auth.models import User
+from django.db import models, transaction
+from django.urls import reverse
 from django.utils import timezone
 
 
+class PrecompiledListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that resolves the child's readable fields once per response
+    instead of re-walking ``child.fields`` for every row.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        # Children that customise to_representation keep the stock per-row path
+        if type(self.child).to_representation is not serializers.Serializer.to_representation:
+            return [self.child.to_representation(item) for item in iterable]
+
+        fields = [
+            (field.field_name, field.get_attribute, field.to_representation)
+            for field in self.child._readable_fields
+        ]
+        rows = []
+        for item in iterable:
+            row = {}
+            for name, get_attribute, to_representation in fields:
+                try:
+                    attribute = get_attribute(item)
+                except SkipField:
+                    continue
+                check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+                row[name] = None if check_for_none is None else to_representation(attribute)
+            rows.append(row)
+        return rows
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -19,6 +54,7 @@ class AssetCategorySerializer(serializers.ModelSerializer):
 class AssetSerializer(serializers.ModelSerializer):
     category = AssetCategorySerializer(read_only=True)
     assigned_to = UserSerializer(read_only=True)
+    qr_code = serializers.SerializerMethodField()
 
     class Meta:
         model = Asset
@@ -27,6 +63,13 @@ class AssetSerializer(serializers.ModelSerializer):
             'model', 'manufacturer', 'mac_address', 'ip_address', 'status', 'condition',
             'location', 'assigned_to', 'date_assigned', 'network_last_seen', 'qr_code'
         ]
+        list_serializer_class = PrecompiledListSerializer
+
+    def get_qr_code(self, obj):
+        # QR PNGs are rendered on request; point clients at that endpoint
+        url = reverse('asset_qr', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class AssetWriteSerializer(serializers.ModelSerializer):
@@ -45,19 +88,19 @@ class AssetWriteSerializer(serializers.ModelSerializer):
         read_only_fields = ['asset_tag']
 
     def create(self, validated_data):
+        # Fold the assignment into the initial INSERT instead of a follow-up UPDATE
         assigned = validated_data.pop('assigned_to', None)
-        asset = Asset.objects.create(**validated_data)
         if assigned:
-            asset.assigned_to = assigned
-            asset.status = 'ASSIGNED'
-            asset.date_assigned = timezone.now()
-            asset.save()
-        return asset
+            validated_data['assigned_to'] = assigned
+            validated_data['status'] = 'ASSIGNED'
+            validated_data['date_assigned'] = timezone.now()
+        return Asset.objects.create(**validated_data)
 
     def update(self, instance, validated_data):
         assigned = validated_data.pop('assigned_to', None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
+        update_fields = list(validated_data)
         if assigned is not None:
             instance.assigned_to = assigned
             instance.status = 'ASSIGNED' if assigned else 'AVAILABLE'
@@ -65,7 +108,9 @@ class AssetWriteSerializer(serializers.ModelSerializer):
                 instance.date_assigned = timezone.now()
             else:
                 instance.date_assigned = None
-        instance.save()
+            update_fields += ['assigned_to', 'status', 'date_assigned']
+        # Only write the columns that changed (plus the auto_now timestamp)
+        instance.save(update_fields=set(update_fields) | {'updated_at'})
         return instance
 
 
@@ -77,6 +122,7 @@ class AssetAssignmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = AssetAssignment
         fields = ['id', 'asset', 'assigned_to', 'assigned_by', 'assignment_type', 'date_out', 'date_due', 'date_returned', 'purpose']
+        list_serializer_class = PrecompiledListSerializer
 
 
 class AssetAssignmentWriteSerializer(serializers.ModelSerializer):
@@ -90,29 +136,31 @@ class AssetAssignmentWriteSerializer(serializers.ModelSerializer):
         assigned_by = request.user if request and request.user.is_authenticated else None
         asset = validated_data.get('asset')
 
-        assignment = AssetAssignment.objects.create(
-            asset=asset,
-            assigned_to=validated_data.get('assigned_to'),
-            assigned_by=assigned_by,
-            assignment_type='ISSUE',
-            date_due=validated_data.get('date_due'),
-            purpose=validated_data.get('purpose', ''),
-        )
-
-        # Update asset
-        asset.status = 'ASSIGNED'
-        asset.assigned_to = assignment.assigned_to
-        asset.date_assigned = assignment.date_out
-        asset.save()
-
-        # Audit
-        AuditLog.objects.create(
-            user=assigned_by,
-            action='ISSUE',
-            model_name='AssetAssignment',
-            object_id=str(assignment.id),
-            description=f'Issued {asset.asset_tag} to {assignment.assigned_to.username if assignment.assigned_to else "N/A"}'
-        )
+        # Assignment, asset status and audit entry commit together
+        with transaction.atomic():
+            assignment = AssetAssignment.objects.create(
+                asset=asset,
+                assigned_to=validated_data.get('assigned_to'),
+                assigned_by=assigned_by,
+                assignment_type='ISSUE',
+                date_due=validated_data.get('date_due'),
+                purpose=validated_data.get('purpose', ''),
+            )
+
+            # Update asset
+            asset.status = 'ASSIGNED'
+            asset.assigned_to = assignment.assigned_to
+            asset.date_assigned = assignment.date_out
+            asset.save(update_fields=['status', 'assigned_to', 'date_assigned', 'updated_at'])
+
+            # Audit
+            record_audit(
+                user=assigned_by,
+                action='ISSUE',
+                model_name='AssetAssignment',
+                object_id=assignment.id,
+                description=LazyAudit('Issued %s to %s', asset.asset_tag, assignment.assigned_to or 'N/A')
+            )
 
         return assignment
 
@@ -123,6 +171,7 @@ class AuditLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = AuditLog
         fields = ['id', 'user', 'action', 'model_name', 'object_id', 'description', 'timestamp']
+        list_serializer_class = PrecompiledListSerializer
 
 
 class MaintenanceRecordSerializer(serializers.ModelSerializer):
@@ -1,17 +1,13 @@
 import pytest
 from rest_framework.test import APIClient
-from django.contrib.auth.models import User
-from asset_management.models import AssetCategory, Asset
+from asset_management.models import Asset, UserProfile
 
 @pytest.mark.django_db
-def test_issue_and_return_asset_api():
+def test_issue_and_return_asset_api(seed_admin, seed_tech, seed_asset):
     client = APIClient()
-    admin = User.objects.create_superuser(username='admin2', email='a2@example.com', password='pass')
-    user = User.objects.create_user(username='tech1', password='pass')
-    client.login(username='admin2', password='pass')
-
-    cat = AssetCategory.objects.create(name='Microphone')
-    asset = Asset.objects.create(name='Test Mic', category=cat, created_by=admin)
+    client.force_login(seed_admin)
+    asset = seed_asset
+    user = seed_tech
 
     # Issue via API
     payload = {
@@ -30,3 +26,37 @@ def test_issue_and_return_asset_api():
     resp2 = client.post(f'/api/assignments/{assignment_id}/return_asset/')
     assert resp2.status_code == 200
     assert Asset.objects.get(id=asset.id).status == 'AVAILABLE'
+
+
+@pytest.mark.django_db
+def test_non_admin_write_denied(seed_tech, seed_category):
+    client = APIClient()
+    client.force_login(seed_tech)
+
+    resp = client.post('/api/assets/', {'name': 'Mixer', 'category': seed_category.id}, format='json')
+    assert resp.status_code == 403
+
+
+@pytest.mark.django_db
+def test_demoted_admin_loses_write_access_in_same_session(seed_tech, seed_category):
+    UserProfile.objects.filter(user=seed_tech).update(role='ADMIN')
+    client = APIClient()
+    client.force_login(seed_tech)
+    assert client.post('/api/categories/', {'name': 'Lenses'}, format='json').status_code == 201
+
+    # A queryset update doesn't touch updated_at; the live role must still win
+    UserProfile.objects.filter(user=seed_tech).update(role='TECH')
+    assert client.post('/api/categories/', {'name': 'Tripods'}, format='json').status_code == 403
+
+
+@pytest.mark.django_db
+def test_demoted_superuser_loses_write_access_in_same_session(seed_tech):
+    seed_tech.is_superuser = True
+    seed_tech.save()
+    client = APIClient()
+    client.force_login(seed_tech)
+    assert client.post('/api/categories/', {'name': 'Lenses'}, format='json').status_code == 201
+
+    seed_tech.is_superuser = False
+    seed_tech.save()
+    assert client.post('/api/categories/', {'name': 'Tripods'}, format='json').status_code == 403
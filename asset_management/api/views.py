@@ -1,29 +1,60 @@
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
 from django.utils import timezone
+from ..audit import LazyAudit, record_audit
 from ..models import Asset, AssetCategory, AssetAssignment, AuditLog, MaintenanceRecord
-from .serializers import AssetSerializer, AssetCategorySerializer, AssetAssignmentSerializer, AuditLogSerializer, MaintenanceRecordSerializer
+from .serializers import (
+    AssetSerializer, AssetWriteSerializer, AssetCategorySerializer, AssetAssignmentSerializer,
+    AssetAssignmentWriteSerializer, AuditLogSerializer, MaintenanceRecordSerializer,
+)
+from .pagination import AssetCursorPagination, AssetAssignmentCursorPagination, AuditLogCursorPagination
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
-        # Allow superusers and explicit ADMIN role
-        if request.user and request.user.is_authenticated and request.user.is_superuser:
+        user = request.user
+        if getattr(user, 'is_superuser', False):
             return True
-        return request.user.is_authenticated and hasattr(request.user, 'profile') and request.user.profile.is_admin()
+        if not (user and user.is_authenticated):
+            return False
+        return self._is_admin(user)
+
+    @staticmethod
+    def _is_admin(user):
+        # The profile arrives with the session user (ProfileModelBackend), so the
+        # live role costs no extra query; RelatedObjectDoesNotExist is an
+        # AttributeError, so a missing profile reads as None
+        profile = getattr(user, 'profile', None)
+        return profile is not None and profile.role == 'ADMIN'
 
 
 class AssetViewSet(viewsets.ModelViewSet):
     queryset = Asset.objects.select_related('category', 'assigned_to').all()
     serializer_class = AssetSerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = AssetCursorPagination
+    # Columns rendered by AssetSerializer; list responses skip everything else
+    list_fields = (
+        'id', 'asset_tag', 'name', 'description', 'serial_number', 'model', 'manufacturer',
+        'mac_address', 'ip_address', 'status', 'condition', 'location', 'date_assigned',
+        'network_last_seen',
+        'category__id', 'category__name', 'category__description',
+        'assigned_to__id', 'assigned_to__username', 'assigned_to__first_name',
+        'assigned_to__last_name', 'assigned_to__email',
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.only(*self.list_fields)
+        return queryset
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
-            from .serializers import AssetWriteSerializer
             return AssetWriteSerializer
         return AssetSerializer
 
@@ -38,10 +69,10 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
     queryset = AssetAssignment.objects.select_related('asset', 'assigned_to', 'assigned_by').all()
     serializer_class = AssetAssignmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AssetAssignmentCursorPagination
 
     def get_serializer_class(self):
         if self.action in ['create']:
-            from .serializers import AssetAssignmentWriteSerializer
             return AssetAssignmentWriteSerializer
         return AssetAssignmentSerializer
 
@@ -52,23 +83,24 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
         if assignment.date_returned:
             return Response({'detail': 'Assignment already returned.'}, status=400)
 
-        assignment.date_returned = timezone.now()
-        assignment.save()
-
-        asset = assignment.asset
-        asset.status = 'AVAILABLE'
-        asset.assigned_to = None
-        asset.date_assigned = None
-        asset.save()
-
-        # Audit
-        AuditLog.objects.create(
-            user=request.user,
-            action='RETURN',
-            model_name='AssetAssignment',
-            object_id=str(assignment.id),
-            description=f'Returned {asset.asset_tag} by API'
-        )
+        with transaction.atomic():
+            assignment.date_returned = timezone.now()
+            assignment.save(update_fields=['date_returned'])
+
+            asset = assignment.asset
+            asset.status = 'AVAILABLE'
+            asset.assigned_to = None
+            asset.date_assigned = None
+            asset.save(update_fields=['status', 'assigned_to', 'date_assigned', 'updated_at'])
+
+            # Audit
+            record_audit(
+                user=request.user,
+                action='RETURN',
+                model_name='AssetAssignment',
+                object_id=assignment.id,
+                description=LazyAudit('Returned %s by API', asset.asset_tag)
+            )
 
         serializer = AssetAssignmentSerializer(assignment, context={'request': request})
         return Response(serializer.data)
@@ -78,6 +110,7 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AuditLog.objects.select_related('user').all()
     serializer_class = AuditLogSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = AuditLogCursorPagination
 
 
 class MaintenanceRecordViewSet(viewsets.ModelViewSet):
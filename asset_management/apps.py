@@ -6,3 +6,9 @@ class AssetManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'asset_management'
     verbose_name = 'AMATS - Asset Management'
+
+    def ready(self):
+        from amats_project.log_queue import start_listener
+        start_listener()
+        from .api import authentication  # noqa: F401  (token cache invalidation)
+        from . import dashboard  # noqa: F401  (dashboard cache invalidation)
@@ -0,0 +1,86 @@
+"""
+AMATS Audit Trail
+Single entry point for writing AuditLog rows, inline or via a batched Celery task
+"""
+import logging
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+
+class LazyAudit:
+    """Audit description rendered with %-formatting only when the entry is saved"""
+    __slots__ = ('template', 'args')
+
+    def __init__(self, template, *args):
+        self.template = template
+        self.args = args
+
+    def __str__(self):
+        return self.template % self.args if self.args else self.template
+
+
+# Unsaved AuditLog rows for the current request plus the atomic-block depth the
+# buffer was opened at (see AuditLogBufferMiddleware)
+_buffer = ContextVar('audit_buffer', default=None)
+
+
+def start_buffer():
+    """Collect synchronous audit entries until flush_buffer(); returns a reset token"""
+    return _buffer.set(([], len(connection.atomic_blocks)))
+
+
+def flush_buffer(token):
+    """Write the collected entries in one INSERT and stop buffering"""
+    entries, _ = _buffer.get()
+    _buffer.reset(token)
+    if entries:
+        for entry in entries:
+            # bulk_create skips AuditLog.save(), which renders LazyAudit descriptions
+            entry.description = str(entry.description)
+        try:
+            with transaction.atomic():
+                AuditLog.objects.bulk_create(entries, batch_size=200)
+        except Exception:
+            # The audited actions are already committed; don't turn them into a 500
+            logger.exception('Failed to write %d buffered audit entries', len(entries))
+
+
+def record_audit(user, action, description, model_name=None, object_id=None, ip_address=None,
+                 level=logging.INFO):
+    """Persist an audit entry; defers the INSERT to Celery when AUDIT_LOG_ASYNC is on"""
+    # Entries below AUDIT_LOG_LEVEL are dropped before their description is rendered
+    if level < settings.AUDIT_LOG_LEVEL:
+        return
+
+    fields = {
+        'user_id': user.pk if user else None,
+        'action': action,
+        'description': description,
+        'model_name': model_name,
+        'object_id': str(object_id) if object_id else None,
+        'ip_address': ip_address,
+    }
+    if not settings.AUDIT_LOG_ASYNC:
+        buffered = _buffer.get()
+        # Inside a transaction the entry is written with it, so the action and
+        # its audit row commit (or roll back) together
+        if buffered is not None and len(connection.atomic_blocks) <= buffered[1]:
+            buffered[0].append(AuditLog(**fields))
+        else:
+            AuditLog.objects.create(**fields)
+        return
+
+    from .tasks import write_audit_logs
+
+    def enqueue():
+        fields['description'] = str(description)
+        write_audit_logs.delay(**fields)
+
+    # Enqueue after commit so the worker never sees entries for rolled-back work
+    transaction.on_commit(enqueue)
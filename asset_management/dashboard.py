@@ -0,0 +1,61 @@
+"""
+AMATS dashboard aggregates
+Status counts and the category breakdown, cached under a version key that
+asset/category writes bump so the next dashboard view recomputes them
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Asset, AssetCategory
+
+DASHBOARD_CACHE_TIMEOUT = 60
+_VERSION_KEY = 'dashboard:ver'
+
+
+def _versioned(name):
+    return f'dashboard:{name}:{cache.get(_VERSION_KEY, 0)}'
+
+
+def _asset_stats():
+    # Every status count from one conditional aggregate
+    return Asset.objects.aggregate(
+        total=Count('id'),
+        available=Count('id', filter=Q(status='AVAILABLE')),
+        assigned=Count('id', filter=Q(status='ASSIGNED')),
+        missing=Count('id', filter=Q(status='MISSING')),
+        maintenance=Count('id', filter=Q(status='MAINTENANCE')),
+    )
+
+
+def _category_stats():
+    return list(AssetCategory.objects.annotate(
+        asset_count=Count('assets')
+    ).values('name', 'asset_count'))
+
+
+def dashboard_stats():
+    """Asset counts by status (total, available, assigned, missing, maintenance)"""
+    return cache.get_or_set(_versioned('stats'), _asset_stats, DASHBOARD_CACHE_TIMEOUT)
+
+
+def dashboard_category_stats():
+    """Asset count per category as a list of {'name', 'asset_count'} dicts"""
+    return cache.get_or_set(_versioned('categories'), _category_stats, DASHBOARD_CACHE_TIMEOUT)
+
+
+def invalidate_dashboard_stats():
+    """Bump the version key; call after bulk writes that bypass model signals"""
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+@receiver(post_save, sender=AssetCategory)
+@receiver(post_delete, sender=AssetCategory)
+def _invalidate_on_write(sender, **kwargs):
+    invalidate_dashboard_stats()
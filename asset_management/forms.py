@@ -1,26 +1,52 @@
 """
 AMATS Forms - Styled with Django Crispy Forms
 """
+import re
+
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.models import User
-from crispy_forms.helper import FormHelper
-from crispy_forms.layout import Layout, Submit, Row, Column, Field, HTML, ButtonHolder
-from crispy_forms.bootstrap import FormActions
-from .models import Asset, AssetAssignment, AssetCategory, UserProfile, MaintenanceRecord
+from django.core.exceptions import ImproperlyConfigured
+from .models import Asset, AssetAssignment, AssetCategory, UserProfile, MaintenanceRecord, normalize_mac_address
+
+_MAC_RE = re.compile(r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')
+
+
+class CachedHelperMixin:
+    """
+    Build the crispy FormHelper once per form class and share it between instances.
+    Subclasses define a build_helper() classmethod that imports crispy itself, so
+    processes that never render a form (management commands, Celery workers)
+    don't load it.
+    """
 
+    @property
+    def helper(self):
+        cls = type(self)
+        # Look in the class's own __dict__ so subclasses don't reuse a parent's layout
+        helper = cls.__dict__.get('_helper')
+        if helper is None:
+            if not hasattr(cls, 'build_helper'):
+                raise ImproperlyConfigured(f'{cls.__name__} uses CachedHelperMixin but defines no build_helper()')
+            helper = cls._helper = cls.build_helper()
+        return helper
 
-class LoginForm(AuthenticationForm):
+
+class LoginForm(CachedHelperMixin, AuthenticationForm):
     """Custom login form with crispy styling"""
     username = forms.CharField(widget=forms.TextInput(attrs={'placeholder': 'Username'}))
     password = forms.CharField(widget=forms.PasswordInput(attrs={'placeholder': 'Password'}))
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.form_class = 'form-horizontal'
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        from crispy_forms.helper import FormHelper
+        from crispy_forms.layout import Layout, Submit, Field
+        from crispy_forms.bootstrap import FormActions
+
+        helper = FormHelper()
+        helper.form_method = 'post'
+        helper.form_class = 'form-horizontal'
+        helper.layout = Layout(
             Field('username', css_class='form-control-lg', wrapper_class='mb-3'),
             Field('password', css_class='form-control-lg', wrapper_class='mb-3'),
             FormActions(
@@ -28,9 +54,10 @@ class LoginForm(AuthenticationForm):
                 css_class='d-grid mt-4'
             )
         )
+        return helper
 
 
-class AssetForm(forms.ModelForm):
+class AssetForm(CachedHelperMixin, forms.ModelForm):
     """Form for creating and editing assets"""
     class Meta:
         model = Asset
@@ -47,12 +74,16 @@ class AssetForm(forms.ModelForm):
             'mac_address': forms.TextInput(attrs={'placeholder': '00:1A:2B:3C:4D:5E'}),
         }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.form_enctype = 'multipart/form-data'
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        from crispy_forms.helper import FormHelper
+        from crispy_forms.layout import Layout, Submit, Row, Column, HTML
+        from crispy_forms.bootstrap import FormActions
+
+        helper = FormHelper()
+        helper.form_method = 'post'
+        helper.form_enctype = 'multipart/form-data'
+        helper.layout = Layout(
             Row(
                 Column('asset_tag', css_class='form-group col-md-6 mb-0'),
                 Column('name', css_class='form-group col-md-6 mb-0'),
@@ -92,18 +123,18 @@ class AssetForm(forms.ModelForm):
                 HTML('<a href="{% url "asset_list" %}" class="btn btn-secondary ms-2">Cancel</a>')
             )
         )
+        return helper
 
     def clean_mac_address(self):
         """Validate MAC address format"""
         mac = self.cleaned_data.get('mac_address')
         if mac:
-            import re
-            if not re.match(r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$', mac):
+            if not _MAC_RE.match(mac):
                 raise forms.ValidationError("Invalid MAC address format. Use XX:XX:XX:XX:XX:XX")
-        return mac
+        return normalize_mac_address(mac)
 
 
-class AssetIssueForm(forms.ModelForm):
+class AssetIssueForm(CachedHelperMixin, forms.ModelForm):
     """Form for issuing assets to technicians"""
     class Meta:
         model = AssetAssignment
@@ -117,12 +148,21 @@ class AssetIssueForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Filter users to show only technicians and staff
-        self.fields['assigned_to'].queryset = User.objects.filter(is_active=True)
+        # Only the columns the assignee picker renders (id + name/username)
+        self.fields['assigned_to'].queryset = User.objects.filter(is_active=True).only(
+            'id', 'username', 'first_name', 'last_name'
+        )
         self.fields['assigned_to'].label = "Assign To"
 
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        from crispy_forms.helper import FormHelper
+        from crispy_forms.layout import Layout, Submit, Row, Column, HTML
+        from crispy_forms.bootstrap import FormActions
+
+        helper = FormHelper()
+        helper.form_method = 'post'
+        helper.layout = Layout(
             Row(
                 Column('assigned_to', css_class='form-group col-md-6 mb-0'),
                 Column('date_due', css_class='form-group col-md-6 mb-0'),
@@ -139,9 +179,10 @@ class AssetIssueForm(forms.ModelForm):
                 HTML('<a href="{{ request.META.HTTP_REFERER }}" class="btn btn-secondary ms-2">Cancel</a>')
             )
         )
+        return helper
 
 
-class AssetReturnForm(forms.ModelForm):
+class AssetReturnForm(CachedHelperMixin, forms.ModelForm):
     """Form for returning assets"""
     class Meta:
         model = AssetAssignment
@@ -150,11 +191,15 @@ class AssetReturnForm(forms.ModelForm):
             'notes': forms.Textarea(attrs={'rows': 3, 'placeholder': 'Any issues or observations...'}),
         }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        from crispy_forms.helper import FormHelper
+        from crispy_forms.layout import Layout, Submit, Field, HTML
+        from crispy_forms.bootstrap import FormActions
+
+        helper = FormHelper()
+        helper.form_method = 'post'
+        helper.layout = Layout(
             Field('condition_returned', css_class='form-select-lg'),
             Field('notes', css_class='mt-3'),
             FormActions(
@@ -162,9 +207,10 @@ class AssetReturnForm(forms.ModelForm):
                 HTML('<a href="{% url "dashboard" %}" class="btn btn-secondary ms-2">Cancel</a>')
             )
         )
+        return helper
 
 
-class AssetFilterForm(forms.Form):
+class AssetFilterForm(CachedHelperMixin, forms.Form):
     """Form for filtering assets in list view"""
     search = forms.CharField(required=False, widget=forms.TextInput(attrs={'placeholder': 'Search assets...'}))
     status = forms.ChoiceField(
@@ -174,7 +220,8 @@ class AssetFilterForm(forms.Form):
     )
     category = forms.ModelChoiceField(
         required=False,
-        queryset=AssetCategory.objects.all(),
+        # The filter dropdown only renders id/name
+        queryset=AssetCategory.objects.only('id', 'name').order_by('name'),
         empty_label="All Categories",
         widget=forms.Select(attrs={'class': 'form-select'})
     )
@@ -184,12 +231,16 @@ class AssetFilterForm(forms.Form):
         widget=forms.Select(attrs={'class': 'form-select'})
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'get'
-        self.helper.form_class = 'form-inline'
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        from crispy_forms.helper import FormHelper
+        from crispy_forms.layout import Layout, Submit, Row, Column, HTML
+        from crispy_forms.bootstrap import FormActions
+
+        helper = FormHelper()
+        helper.form_method = 'get'
+        helper.form_class = 'form-inline'
+        helper.layout = Layout(
             Row(
                 Column('search', css_class='form-group col-md-4 mb-0'),
                 Column('status', css_class='form-group col-md-2 mb-0'),
@@ -202,9 +253,10 @@ class AssetFilterForm(forms.Form):
                 HTML('<a href="{% url "asset_list" %}" class="btn btn-outline-secondary btn-sm ms-2">Clear</a>')
             )
         )
+        return helper
 
 
-class UserProfileForm(forms.ModelForm):
+class UserProfileForm(CachedHelperMixin, forms.ModelForm):
     """Form for editing user profile"""
     first_name = forms.CharField(max_length=30, required=False)
     last_name = forms.CharField(max_length=30, required=False)
@@ -221,9 +273,15 @@ class UserProfileForm(forms.ModelForm):
             self.fields['last_name'].initial = self.instance.user.last_name
             self.fields['email'].initial = self.instance.user.email
 
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        from crispy_forms.helper import FormHelper
+        from crispy_forms.layout import Layout, Submit, Row, Column
+        from crispy_forms.bootstrap import FormActions
+
+        helper = FormHelper()
+        helper.form_method = 'post'
+        helper.layout = Layout(
             Row(
                 Column('first_name', css_class='form-group col-md-6 mb-0'),
                 Column('last_name', css_class='form-group col-md-6 mb-0'),
@@ -244,6 +302,7 @@ class UserProfileForm(forms.ModelForm):
                 Submit('submit', 'Update Profile', css_class='btn btn-primary')
             )
         )
+        return helper
 
     def save(self, commit=True):
         profile = super().save(commit=False)
@@ -257,7 +316,7 @@ class UserProfileForm(forms.ModelForm):
         return profile
 
 
-class MaintenanceRecordForm(forms.ModelForm):
+class MaintenanceRecordForm(CachedHelperMixin, forms.ModelForm):
     """Form for logging maintenance activities"""
     class Meta:
         model = MaintenanceRecord
@@ -268,11 +327,15 @@ class MaintenanceRecordForm(forms.ModelForm):
             'description': forms.Textarea(attrs={'rows': 4}),
         }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        from crispy_forms.helper import FormHelper
+        from crispy_forms.layout import Layout, Submit, Row, Column
+        from crispy_forms.bootstrap import FormActions
+
+        helper = FormHelper()
+        helper.form_method = 'post'
+        helper.layout = Layout(
             Row(
                 Column('maintenance_type', css_class='form-group col-md-6 mb-0'),
                 Column('date_performed', css_class='form-group col-md-6 mb-0'),
@@ -288,9 +351,10 @@ class MaintenanceRecordForm(forms.ModelForm):
                 Submit('submit', 'Log Maintenance', css_class='btn btn-primary')
             )
         )
+        return helper
 
 
-class NetworkScanForm(forms.Form):
+class NetworkScanForm(CachedHelperMixin, forms.Form):
     """Form to trigger manual network scan"""
     subnet = forms.CharField(
         max_length=18,
@@ -305,11 +369,15 @@ class NetworkScanForm(forms.Form):
         help_text="Scan timeout per host (seconds)"
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        from crispy_forms.helper import FormHelper
+        from crispy_forms.layout import Layout, Submit, Row, Column
+        from crispy_forms.bootstrap import FormActions
+
+        helper = FormHelper()
+        helper.form_method = 'post'
+        helper.layout = Layout(
             Row(
                 Column('subnet', css_class='form-group col-md-8 mb-0'),
                 Column('timeout', css_class='form-group col-md-4 mb-0'),
@@ -320,6 +388,7 @@ class NetworkScanForm(forms.Form):
                 css_class='mt-3'
             )
         )
+        return helper
 
     def clean_subnet(self):
         import ipaddress
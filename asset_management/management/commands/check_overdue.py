@@ -3,6 +3,7 @@ Django management command to check overdue assets
 Usage: python manage.py check_overdue
 """
 from django.core.management.base import BaseCommand
+from django.db.models import Count, DateTimeField, DurationField, ExpressionWrapper, F, Q, Value
 from django.utils import timezone
 from datetime import timedelta
 from asset_management.models import AssetAssignment
@@ -21,30 +22,36 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         days = options['days']
-        threshold = timezone.now() - timedelta(days=days)
-
-        overdue = AssetAssignment.objects.filter(
-            date_due__lt=timezone.now(),
-            date_returned__isnull=True
-        )
-
-        really_overdue = AssetAssignment.objects.filter(
-            date_due__lt=threshold,
-            date_returned__isnull=True
+        now = timezone.now()
+        threshold = now - timedelta(days=days)
+
+        # Both counts in one aggregate over the open assignments
+        open_assignments = AssetAssignment.objects.filter(date_returned__isnull=True)
+        counts = open_assignments.aggregate(
+            total=Count('id', filter=Q(date_due__lt=now)),
+            critical=Count('id', filter=Q(date_due__lt=threshold)),
         )
 
         self.stdout.write(f'Checking for overdue assets (>{days} days)...')
-        self.stdout.write(f'Found {overdue.count()} overdue assignments')
-        self.stdout.write(f'Found {really_overdue.count()} critically overdue (>30 days)')
-
-        for assignment in really_overdue[:10]:  # Show first 10
-            days_overdue = (timezone.now() - assignment.date_due).days
-            self.stdout.write(
-                self.style.ERROR(
-                    f'OVERDUE: {assignment.asset.asset_tag} - {days_overdue} days - '
-                    f'Assigned to: {assignment.assigned_to.get_full_name()}'
+        self.stdout.write(f'Found {counts["total"]} overdue assignments')
+        self.stdout.write(f'Found {counts["critical"]} critically overdue (>30 days)')
+
+        if counts['critical']:
+            # Plain tuples for the display loop; the JOINs come from the values_list lookups
+            really_overdue = open_assignments.filter(date_due__lt=threshold).annotate(
+                overdue_for=ExpressionWrapper(
+                    Value(now, output_field=DateTimeField()) - F('date_due'), output_field=DurationField()
+                )
+            ).order_by('date_due').values_list(
+                'asset__asset_tag', 'assigned_to__first_name', 'assigned_to__last_name', 'overdue_for'
+            )[:10]  # Show first 10
+            for asset_tag, first_name, last_name, overdue_for in really_overdue:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'OVERDUE: {asset_tag} - {overdue_for.days} days - '
+                        f'Assigned to: {f"{first_name} {last_name}".strip()}'
+                    )
                 )
-            )
 
-        if not overdue.exists():
+        if counts['total'] == 0:
             self.stdout.write(self.style.SUCCESS('No overdue assets found!'))
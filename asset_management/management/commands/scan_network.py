@@ -3,9 +3,7 @@ Django management command to scan network for assets
 Usage: python manage.py scan_network --subnet 192.168.1.0/24
 """
 from django.core.management.base import BaseCommand, CommandError
-from django.utils import timezone
-from asset_management.models import Asset
-from network_scanner.scanner import NetworkScanner
+from network_scanner.scanner import PROBE_MODES, NetworkScanner, apply_scan_results
 import sys
 
 
@@ -25,6 +23,20 @@ class Command(BaseCommand):
             default=1,
             help='Timeout in seconds for each host (default: 1)'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=64,
+            help='Number of hosts probed concurrently (default: 64)'
+        )
+        parser.add_argument(
+            '--probe',
+            choices=PROBE_MODES,
+            default='icmp',
+            help='Host discovery: icmp ping, tcp connect to common ports, both, or arp '
+                 '(raw ARP sweep of a directly attached subnet; needs Linux and root/CAP_NET_RAW, '
+                 'falls back to icmp otherwise) (default: icmp)'
+        )
 
     def handle(self, *args, **options):
         subnet = options['subnet']
@@ -36,50 +48,36 @@ class Command(BaseCommand):
         self.stdout.write(f'Timeout: {timeout}s per host')
         self.stdout.write('-' * 50)
 
-        scanner = NetworkScanner(subnet, timeout)
+        scanner = NetworkScanner(subnet, timeout, max_workers=options['workers'], probe_mode=options['probe'])
         results = scanner.scan()
 
-        found_count = 0
-        matched_count = 0
-        missing_found = 0
+        matched, found_missing = apply_scan_results(results, missing_location='Auto-detected: {ip}')
+        found_missing_ids = {asset.id for asset in found_missing}
 
         for result in results:
-            if not result['mac_address']:
+            if not result.mac_address:
                 continue
 
-            try:
-                asset = Asset.objects.get(mac_address__iexact=result['mac_address'])
-                asset.network_last_seen = timezone.now()
-                asset.ip_address = result['ip_address']
-
-                if asset.status == 'MISSING':
-                    asset.status = 'AVAILABLE'
-                    asset.location = f"Auto-detected: {result['ip_address']}"
-                    missing_found += 1
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f'[FOUND MISSING] {asset.asset_tag} at {result["ip_address"]}'
-                        )
-                    )
-                else:
-                    self.stdout.write(
-                        f'[DETECTED] {asset.asset_tag} at {result["ip_address"]}'
-                    )
-
-                asset.save()
-                matched_count += 1
-
-            except Asset.DoesNotExist:
+            if not result.asset_found:
                 self.stdout.write(
                     self.style.WARNING(
-                        f'[UNKNOWN] Device at {result["ip_address"]} - {result["mac_address"]}'
+                        f'[UNKNOWN] Device at {result.ip_address} - {result.mac_address}'
                     )
                 )
-                found_count += 1
+            elif result.asset_id in found_missing_ids:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'[FOUND MISSING] {result.asset_tag} at {result.ip_address}'
+                    )
+                )
+            else:
+                self.stdout.write(
+                    f'[DETECTED] {result.asset_tag} at {result.ip_address}'
+                )
 
         self.stdout.write('-' * 50)
         self.stdout.write(
             self.style.SUCCESS(
-                f'Scan complete: {len(results)} hosts up, {matched_count} assets matched, {missing_found} missing found'
+                f'Scan complete: {len(results)} hosts up, {len(matched)} assets matched, {len(found_missing)} missing found'
             )
         )
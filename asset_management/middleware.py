@@ -0,0 +1,22 @@
+"""
+AMATS middleware
+"""
+from .audit import flush_buffer, start_buffer
+
+
+class AuditLogBufferMiddleware:
+    """Batch a request's synchronous audit entries into one INSERT after the view returns
+
+    Entries recorded inside transaction.atomic() skip the buffer and are written
+    with that transaction.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = start_buffer()
+        try:
+            return self.get_response(request)
+        finally:
+            flush_buffer(token)
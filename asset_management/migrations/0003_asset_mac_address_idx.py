@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-14 18:57
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Lower, Replace, Trim
+
+
+def normalize_mac_addresses(apps, schema_editor):
+    Asset = apps.get_model('asset_management', 'Asset')
+    Asset.objects.exclude(mac_address__isnull=True).update(
+        mac_address=Replace(Lower(Trim('mac_address')), Value('-'), Value(':'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset_management', '0002_notification_auditlog_timestamp_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_mac_addresses, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['mac_address'], name='asset_mac_address_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 18:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset_management', '0003_asset_mac_address_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(fields=['date_returned', 'date_due'], name='assignment_open_due_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset_management', '0004_assignment_open_due_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='assetassignment',
+            name='assignment_open_due_idx',
+        ),
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(condition=models.Q(('date_returned__isnull', True)), fields=['date_due'], name='assignment_open_due_idx'),
+        ),
+    ]
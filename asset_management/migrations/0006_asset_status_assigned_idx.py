@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset_management', '0005_assignment_open_due_partial_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['status', 'date_assigned'], name='asset_status_assigned_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset_management', '0006_asset_status_assigned_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='asset',
+            name='qr_code',
+        ),
+    ]
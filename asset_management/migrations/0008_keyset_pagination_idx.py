@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asset_management', '0007_remove_asset_qr_code'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='auditlog_timestamp_idx',
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['-created_at', '-id'], name='asset_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-timestamp', '-id'], name='auditlog_timestamp_id_idx'),
+        ),
+    ]
@@ -2,10 +2,9 @@
 AMATS Models - Access Management and Asset Tracking System
 UTV Ghana Field Study Implementation
 """
-import uuid
 import qrcode
+from functools import lru_cache
 from io import BytesIO
-from django.core.files import File
 from django.db import models
 import random
 from django.utils.text import slugify
@@ -13,6 +12,40 @@ from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
+from datetime import timedelta
+
+# Assets held longer than this count as overdue (Asset.is_overdue)
+_OVERDUE_DELTA = timedelta(days=30)
+
+
+@lru_cache(maxsize=512)
+def _render_qr_png(qr_data):
+    """PNG bytes for a QR payload; cached so re-saves of the same payload skip rendering"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+        # A fixed mask skips best_mask_pattern's trial renders of all 8 masks
+        mask_pattern=0,
+    )
+    qr.add_data(qr_data)
+    qr.make(fit=True)
+
+    # Generate image
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    # Save to buffer; zlib level 1 encodes ~10% faster for a few hundred extra bytes
+    buffer = BytesIO()
+    img.save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+def normalize_mac_address(mac):
+    """Canonical stored form of a MAC address: lowercase, colon-separated"""
+    if not mac:
+        return mac
+    return mac.strip().lower().replace('-', ':')
 
 
 class UserProfile(models.Model):
@@ -61,6 +94,19 @@ class AssetCategory(models.Model):
         verbose_name_plural = "Asset Categories"
 
 
+class AssetQuerySet(models.QuerySet):
+    def with_overdue(self, delta=None):
+        """Annotate ``overdue``: assigned for longer than ``delta`` (see Asset.is_overdue)"""
+        return self.annotate(overdue=models.Case(
+            models.When(
+                status='ASSIGNED', date_assigned__lt=timezone.now() - (delta or _OVERDUE_DELTA),
+                then=models.Value(True),
+            ),
+            default=models.Value(False),
+            output_field=models.BooleanField(),
+        ))
+
+
 class Asset(models.Model):
     """IT and Broadcast Equipment Assets"""
     STATUS_CHOICES = [
@@ -108,12 +154,13 @@ class Asset(models.Model):
     
     # Security and audit
     network_last_seen = models.DateTimeField(blank=True, null=True, help_text="Last time device was detected on network")
-    qr_code = models.ImageField(upload_to='qr_codes/', blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='assets_created')
+
+    objects = AssetQuerySet.as_manager()
     
     def __str__(self):
         return f"{self.asset_tag} - {self.name}"
@@ -127,67 +174,45 @@ class Asset(models.Model):
         else:
             cat_abbrev = 'OTH'
 
-        # Try random 4-digit sequence until unique
-        for _ in range(10):
-            seq = f"{random.randint(0, 9999):04d}"
-            candidate = f"{prefix}-{cat_abbrev}-{seq}"
-            if not Asset.objects.filter(asset_tag=candidate).exists():
+        # Draw 10 random 4-digit sequences and check them all in one query
+        candidates = [f"{prefix}-{cat_abbrev}-{random.randint(0, 9999):04d}" for _ in range(10)]
+        taken = set(Asset.objects.filter(asset_tag__in=candidates).values_list('asset_tag', flat=True))
+        for candidate in candidates:
+            if candidate not in taken:
                 return candidate
-        # Fallback to UUID short
-        return f"{prefix}-{cat_abbrev}-{uuid.uuid4().hex[:6].upper()}"
+        # Fallback to a longer 6-hex-digit random suffix
+        return f"{prefix}-{cat_abbrev}-{random.getrandbits(24):06X}"
 
     def save(self, *args, **kwargs):
         # Ensure asset_tag present
         if not self.asset_tag:
             self.asset_tag = self._generate_asset_tag()
-
-        # Generate QR if missing after create
-        creating = self._state.adding
+        # Stored MACs are normalized so scans can match them with plain equality
+        self.mac_address = normalize_mac_address(self.mac_address)
         super().save(*args, **kwargs)
-        if creating and not self.qr_code:
-            try:
-                self.generate_qr_code()
-                super().save(update_fields=['qr_code'])
-            except Exception:
-                pass
     
     def is_overdue(self):
         """Check if asset assignment is overdue (configurable threshold)"""
-        if self.status == 'ASSIGNED' and self.date_assigned:
-            threshold = timezone.now() - timezone.timedelta(days=30)  # 30 days default
-            return self.date_assigned < threshold
-        return False
+        if 'overdue' in self.__dict__:  # annotated by AssetQuerySet.with_overdue()
+            return self.overdue
+        return (
+            self.status == 'ASSIGNED' and self.date_assigned is not None
+            and self.date_assigned < timezone.now() - _OVERDUE_DELTA
+        )
     
     def days_since_assignment(self):
         if self.date_assigned:
             return (timezone.now() - self.date_assigned).days
         return None
     
-    def generate_qr_code(self):
-        """Generate QR code for asset"""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        
-        # QR code data: asset tag and serial number
-        qr_data = f"AMATS|{self.asset_tag}|{self.serial_number or 'N/A'}"
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        
-        # Generate image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save to buffer
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        filename = f'qr_{self.asset_tag.replace("-", "_")}.png'
-        
-        # Save to model
-        self.qr_code.save(filename, File(buffer), save=False)
-        buffer.close()
+    @property
+    def qr_data(self):
+        """QR code payload: asset tag and serial number"""
+        return f"AMATS|{self.asset_tag}|{self.serial_number or 'N/A'}"
+
+    def qr_code_png(self):
+        """QR code PNG bytes, rendered from the payload on demand (nothing is stored)"""
+        return _render_qr_png(self.qr_data)
     
     class Meta:
         ordering = ['-created_at']
@@ -195,6 +220,23 @@ class Asset(models.Model):
             ("can_view_all_assets", "Can view all assets in system"),
             ("can_edit_assets", "Can edit asset details"),
         ]
+        indexes = [
+            models.Index(fields=['mac_address'], name='asset_mac_address_idx'),
+            # Dashboard "overdue" filter: status='ASSIGNED' AND date_assigned < cutoff
+            models.Index(fields=['status', 'date_assigned'], name='asset_status_assigned_idx'),
+            # Keyset pagination of the asset list: ORDER BY created_at DESC, id DESC
+            models.Index(fields=['-created_at', '-id'], name='asset_created_id_idx'),
+        ]
+
+
+class AssetAssignmentQuerySet(models.QuerySet):
+    def with_overdue(self):
+        """Annotate ``overdue``: still out past its due date (see AssetAssignment.is_overdue)"""
+        return self.annotate(overdue=models.Case(
+            models.When(date_returned__isnull=True, date_due__lt=timezone.now(), then=models.Value(True)),
+            default=models.Value(False),
+            output_field=models.BooleanField(),
+        ))
 
 
 class AssetAssignment(models.Model):
@@ -224,17 +266,31 @@ class AssetAssignment(models.Model):
     acknowledgement_signed = models.BooleanField(default=False, help_text="Physical signature collected")
     checkout_ip = models.GenericIPAddressField(blank=True, null=True)
     return_ip = models.GenericIPAddressField(blank=True, null=True)
+
+    objects = AssetAssignmentQuerySet.as_manager()
     
     def __str__(self):
         return f"{self.asset.asset_tag} -> {self.assigned_to.username} ({self.assignment_type})"
     
     def is_overdue(self):
+        if 'overdue' in self.__dict__:  # annotated by AssetAssignmentQuerySet.with_overdue()
+            return self.overdue
         if self.date_due and not self.date_returned:
             return timezone.now() > self.date_due
         return False
     
     class Meta:
         ordering = ['-date_out']
+        indexes = [
+            # Partial index over open assignments only, for the overdue scans that
+            # filter date_returned IS NULL and range/order on date_due
+            models.Index(
+                fields=['date_due'], condition=models.Q(date_returned__isnull=True),
+                name='assignment_open_due_idx',
+            ),
+            # A user's current (date_returned IS NULL) and past assignments on the profile page
+            models.Index(fields=['assigned_to', 'date_returned'], name='assignment_user_returned_idx'),
+        ]
 
 
 class AuditLog(models.Model):
@@ -261,9 +317,20 @@ class AuditLog(models.Model):
     
     def __str__(self):
         return f"{self.action} by {self.user} at {self.timestamp}"
+
+    def save(self, *args, **kwargs):
+        # Render deferred (LazyAudit) descriptions at the last moment
+        self.description = str(self.description)
+        super().save(*args, **kwargs)
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # id breaks timestamp ties for keyset pagination of the audit log
+            models.Index(fields=['-timestamp', '-id'], name='auditlog_timestamp_id_idx'),
+            # Audit log page filtered by action type, newest first
+            models.Index(fields=['action', '-timestamp'], name='auditlog_action_ts_idx'),
+        ]
 
 
 class Notification(models.Model):
@@ -316,6 +383,3 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance, employee_id=f"UTV-{instance.id:04d}")
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+AMATS list pagination
+Keyset (seek) pagination for the web list views: pages are addressed by the
+(timestamp, id) of a boundary row instead of an OFFSET, and no COUNT is run
+"""
+from datetime import datetime
+
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator; mirrors the parts of Page the templates use"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[-1]) if self._has_next else None
+
+    @property
+    def previous_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[0]) if self._has_previous else None
+
+
+class KeysetPaginator:
+    """
+    Newest-first seek pagination over ``(field, pk)``. ``after`` pages towards
+    older rows, ``before`` towards newer ones; each page is one indexed range
+    scan of ``per_page + 1`` rows.
+    """
+
+    def __init__(self, object_list, per_page, field):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.field = field
+
+    def encode_cursor(self, obj):
+        return f'{getattr(obj, self.field).isoformat()}|{obj.pk}'
+
+    def decode_cursor(self, cursor):
+        try:
+            value, pk = cursor.rsplit('|', 1)
+            return datetime.fromisoformat(value), int(pk)
+        except (TypeError, ValueError):
+            raise InvalidPage('Invalid cursor')
+
+    def page(self, after=None, before=None):
+        field = self.field
+        queryset = self.object_list
+        if before:
+            value, pk = self.decode_cursor(before)
+            queryset = queryset.filter(
+                Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+            ).order_by(field, 'pk')
+            rows = list(queryset[:self.per_page + 1])
+            # Walking backwards: the extra row means there are newer pages still
+            has_previous = len(rows) > self.per_page
+            return KeysetPage(rows[:self.per_page][::-1], self, has_next=True, has_previous=has_previous)
+
+        if after:
+            value, pk = self.decode_cursor(after)
+            queryset = queryset.filter(
+                Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk})
+            )
+        rows = list(queryset.order_by(f'-{field}', '-pk')[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return KeysetPage(rows[:self.per_page], self, has_next=has_next, has_previous=bool(after))
+
+
+class CountlessPage(Page):
+    """Numbered page that already knows whether another page follows it"""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountlessPaginator(Paginator):
+    """
+    Numbered pages without a COUNT(*): each page fetches one extra row to learn
+    whether there is a next one. ``count``/``num_pages`` are never evaluated,
+    so templates show "Page N" with Previous/Next rather than "N of M".
+    """
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def _window(self, bottom, top):
+        return self.object_list[bottom:top]
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self._window(bottom, bottom + self.per_page + 1))
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return CountlessPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+
+class PKSlicePaginator(CountlessPaginator):
+    """
+    CountlessPaginator whose OFFSET runs over primary keys only (in a
+    subquery); the wide rows are fetched just for the page being shown.
+    Backends that reject LIMIT inside IN (MySQL/MariaDB) fetch the page's
+    primary keys with a separate query first.
+    """
+
+    def _window(self, bottom, top):
+        pks = self.object_list.values('pk')[bottom:top]
+        if not connections[self.object_list.db].features.allow_sliced_subqueries_with_in:
+            pks = list(pks)
+        return self.object_list.filter(pk__in=pks)
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin: paginate newest-first on ``keyset_field`` using ?after= /
+    ?before= cursors. Adds ``next_query``/``previous_query`` (the current
+    filters plus the cursor) to the context for the pager links. A bare
+    ?page=N still jumps straight to page N through ``paginator_class``.
+    """
+    keyset_field = 'created_at'
+
+    def paginate_queryset(self, queryset, page_size):
+        queryset = queryset.order_by(f'-{self.keyset_field}', '-pk')
+        cursor_given = 'after' in self.request.GET or 'before' in self.request.GET
+        if self.page_kwarg in self.request.GET and not cursor_given:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_field)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def _page_query(self, **cursor):
+        params = self.request.GET.copy()
+        for key in ('after', 'before', 'page'):
+            params.pop(key, None)
+        params.update(cursor)
+        return params.urlencode()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None and not isinstance(page, KeysetPage):
+            if page.has_next():
+                context['next_query'] = self._page_query(**{self.page_kwarg: page.next_page_number()})
+            if page.has_previous():
+                context['previous_query'] = self._page_query(**{self.page_kwarg: page.previous_page_number()})
+        elif page is not None:
+            if page.has_next():
+                context['next_query'] = self._page_query(after=page.next_cursor)
+            if page.has_previous():
+                context['previous_query'] = self._page_query(before=page.previous_cursor)
+        return context
@@ -1,23 +1,42 @@
 from celery import shared_task
-from celery.exceptions import MaxRetriesExceededError
 from django.utils import timezone
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 from django.conf import settings
+from django.db import transaction
 from .models import AssetAssignment, AuditLog, Notification
 
+try:
+    from celery_batches import Batches
+except ImportError:  # optional: fall back to one INSERT per task
+    Batches = None
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def check_overdue_assignments(self):
-    """Find overdue assignments, create notifications and attempt email sends with retries."""
+# The project package no longer loads Celery eagerly; importing the app here
+# makes any process that enqueues these tasks publish via the configured broker.
+from amats_project.celery import app  # noqa: F401
+
+
+@shared_task(ignore_result=True)
+def check_overdue_assignments():
+    """Find overdue assignments, create notifications and queue the email sends."""
     overdue = AssetAssignment.objects.filter(
         date_due__lt=timezone.now(),
         date_returned__isnull=True
-    ).select_related('asset', 'assigned_to', 'assigned_by')
+    ).select_related('asset', 'assigned_to', 'assigned_by').only(
+        # FK columns stay in the set so select_related can stitch the joined rows
+        'id', 'date_due', 'asset', 'assigned_to', 'assigned_by',
+        'asset__name', 'asset__asset_tag',
+        'assigned_to__email', 'assigned_to__username', 'assigned_to__first_name', 'assigned_to__last_name',
+        'assigned_by__email', 'assigned_by__username', 'assigned_by__first_name', 'assigned_by__last_name',
+    )
+    overdue_list = list(overdue)
 
+    # Rows are collected here and written with one bulk INSERT per table
+    notifications = []
+    audit_logs = []
+    emails = []
     notifications_created = 0
-    email_notifications = 0
 
-    for assignment in overdue:
+    for assignment in overdue_list:
         try:
             subject = f'Overdue Asset Alert: {assignment.asset.asset_tag}'
             message = (
@@ -29,60 +48,130 @@ def check_overdue_assignments(self):
 
             recipients = []
             if assignment.assigned_by:
-                Notification.objects.create(
+                notifications.append(Notification(
                     user=assignment.assigned_by,
                     message=message,
                     link=f'/assignments/{assignment.id}/',
                     level='ALERT'
-                )
+                ))
                 notifications_created += 1
                 if assignment.assigned_by.email:
                     recipients.append(assignment.assigned_by.email)
 
             if assignment.assigned_to:
-                Notification.objects.create(
+                notifications.append(Notification(
                     user=assignment.assigned_to,
                     message=message,
                     link=f'/assignments/{assignment.id}/',
                     level='WARNING'
-                )
+                ))
                 notifications_created += 1
                 if assignment.assigned_to.email:
                     recipients.append(assignment.assigned_to.email)
 
-            # Attempt email send if configured
-            if recipients and getattr(settings, 'EMAIL_HOST', ''):
-                try:
-                    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, recipients, fail_silently=False)
-                    email_notifications += 1
-                except Exception as exc:
-                    try:
-                        raise self.retry(exc=exc)
-                    except MaxRetriesExceededError:
-                        AuditLog.objects.create(
-                            user=None,
-                            action='EXPORT',
-                            model_name='AssetAssignment',
-                            object_id=str(assignment.id),
-                            description=f'Failed to send overdue email after retries: {str(exc)}'
-                        )
+            if recipients:
+                emails.append((subject, message, settings.DEFAULT_FROM_EMAIL, recipients))
 
             # Record audit log of notification creation
-            AuditLog.objects.create(
+            audit_logs.append(AuditLog(
                 user=None,
                 action='EXPORT',
                 model_name='AssetAssignment',
                 object_id=str(assignment.id),
                 description=f'Created {notifications_created} notifications for overdue assignment {assignment.id}'
-            )
+            ))
 
         except Exception as e:
-            AuditLog.objects.create(
+            audit_logs.append(AuditLog(
                 user=None,
                 action='EXPORT',
                 model_name='AssetAssignment',
                 object_id=str(assignment.id),
                 description=f'Unexpected error in overdue task: {str(e)}'
+            ))
+
+    # Write everything collected in one transaction
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications, batch_size=500)
+        AuditLog.objects.bulk_create(audit_logs, batch_size=1000)
+
+    # Emails go out from their own task so an SMTP retry doesn't re-run (and
+    # duplicate) the notifications above; that task audits delivery failures.
+    # The task's result is ignored, so there is no summary to return.
+    if emails and getattr(settings, 'EMAIL_HOST', ''):
+        send_overdue_emails.delay(emails)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60, ignore_result=True)
+def send_overdue_emails(self, emails):
+    """Send overdue alerts over a single SMTP connection, retrying only the messages that failed."""
+    failed = []
+    last_exc = None
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        failed, last_exc = list(emails), exc
+    else:
+        try:
+            for subject, message, from_email, recipients in emails:
+                try:
+                    EmailMessage(subject, message, from_email, recipients, connection=connection).send()
+                except Exception as exc:
+                    failed.append((subject, message, from_email, recipients))
+                    last_exc = exc
+        finally:
+            connection.close()
+
+    if failed:
+        # retry(exc=...) re-raises the SMTP error once retries run out, so the
+        # final failure has to be recorded before asking for another attempt
+        if self.request.retries >= self.max_retries:
+            AuditLog.objects.create(
+                user=None,
+                action='EXPORT',
+                model_name='AssetAssignment',
+                description=f'Failed to send {len(failed)} overdue emails after retries: {str(last_exc)}'
             )
+            return
+        # Back off 60s, 120s, 240s so a struggling SMTP relay isn't hammered
+        raise self.retry(args=(failed,), exc=last_exc, countdown=self.default_retry_delay * 2 ** self.request.retries)
+
+
+@shared_task(ignore_result=True)
+def scan_subnet(subnet, timeout, user_id, ip_address=None):
+    """Run a manual network scan off the request cycle and notify the user who started it."""
+    from django.contrib.auth.models import User
+    from network_scanner.scanner import NetworkScanner, apply_scan_results
+    from .audit import LazyAudit, record_audit
+
+    results = NetworkScanner(subnet, timeout).scan()
+    matched, found_missing = apply_scan_results(results)
+
+    record_audit(
+        User.objects.filter(pk=user_id).first(), 'SCAN',
+        LazyAudit('Network scan performed on %s. Found %d devices.', subnet, len(results)),
+        ip_address=ip_address,
+    )
+    message = f'Network scan of {subnet} completed. Found {len(results)} devices, {len(matched)} known assets.'
+    if found_missing:
+        message += ' Missing assets found: ' + ', '.join(asset.asset_tag for asset in found_missing)
+    Notification.objects.create(
+        user_id=user_id,
+        message=message,
+        link='/network-scan/',
+        level='WARNING' if found_missing else 'INFO',
+    )
+    return {'scanned': len(results), 'matched': len(matched), 'missing_found': len(found_missing)}
+
 
-    return {'overdue_count': overdue.count(), 'notifications_created': notifications_created, 'email_notifications': email_notifications}
+if Batches is not None:
+    @shared_task(base=Batches, flush_every=100, flush_interval=5, ignore_result=True)
+    def write_audit_logs(requests):
+        """Flush buffered audit entries with a single bulk INSERT."""
+        AuditLog.objects.bulk_create([AuditLog(**r.kwargs) for r in requests], batch_size=500)
+else:
+    @shared_task(ignore_result=True)
+    def write_audit_logs(**fields):
+        """Write one audit entry (celery-batches not installed)."""
+        AuditLog.objects.create(**fields)
@@ -2,10 +2,13 @@
 AMATS Unit Tests
 Tests for models, views, and network scanner
 """
-from django.test import TestCase, Client
+import logging
+from django.test import TestCase, Client, override_settings
+from django.db import transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import timedelta
+from asset_management.audit import LazyAudit, flush_buffer, record_audit, start_buffer
 from asset_management.models import Asset, AssetCategory, AssetAssignment, UserProfile, AuditLog
 
 
@@ -62,6 +65,23 @@ class AssetModelTest(TestCase):
 
         self.assertTrue(self.asset.is_overdue())
 
+    def test_overdue_annotation(self):
+        """with_overdue() computes the same flag in SQL"""
+        self.assertFalse(Asset.objects.with_overdue().get(pk=self.asset.pk).overdue)
+
+        self.asset.status = 'ASSIGNED'
+        self.asset.date_assigned = timezone.now() - timedelta(days=31)
+        self.asset.save()
+
+        self.assertTrue(Asset.objects.with_overdue().get(pk=self.asset.pk).overdue)
+
+    def test_mac_address_normalized_on_save(self):
+        """MAC addresses are stored lowercase and colon-separated"""
+        self.asset.mac_address = 'AA-BB-CC-DD-EE-FF'
+        self.asset.save()
+        self.asset.refresh_from_db()
+        self.assertEqual(self.asset.mac_address, 'aa:bb:cc:dd:ee:ff')
+
 
 class AssetAssignmentModelTest(TestCase):
     """Test AssetAssignment model"""
@@ -175,3 +195,37 @@ class AuditLogTest(TestCase):
         )
         self.assertEqual(log.action, 'CREATE')
         self.assertIsNotNone(log.timestamp)
+
+    @override_settings(AUDIT_LOG_LEVEL=logging.INFO)
+    def test_lazy_description_rendered_on_save_and_level_gated(self):
+        """Deferred descriptions render when saved; entries below AUDIT_LOG_LEVEL are skipped"""
+        record_audit(self.user, 'UPDATE', LazyAudit('Updated asset %s', 'UTV-0001'))
+        record_audit(self.user, 'UPDATE', LazyAudit('Noisy %s', 'detail'), level=logging.DEBUG)
+        self.assertEqual(
+            list(AuditLog.objects.values_list('description', flat=True)),
+            ['Updated asset UTV-0001'],
+        )
+
+    def test_buffered_entries_flushed_together(self):
+        """Buffered entries are held back until the flush, then rendered and inserted"""
+        token = start_buffer()
+        record_audit(self.user, 'UPDATE', LazyAudit('Updated asset %s', 'UTV-0001'))
+        record_audit(self.user, 'DELETE', LazyAudit('Deleted asset %s', 'UTV-0002'))
+        self.assertEqual(AuditLog.objects.count(), 0)
+        with self.assertNumQueries(3):  # SAVEPOINT, INSERT, RELEASE
+            flush_buffer(token)
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list('description', flat=True)),
+            ['Deleted asset UTV-0002', 'Updated asset UTV-0001'],
+        )
+
+    def test_entries_inside_transaction_are_not_buffered(self):
+        """Entries recorded inside atomic() are written with that transaction"""
+        token = start_buffer()
+        with transaction.atomic():
+            record_audit(self.user, 'RETURN', 'Returned asset UTV-0001')
+            self.assertEqual(AuditLog.objects.count(), 1)
+        record_audit(self.user, 'UPDATE', 'Updated asset UTV-0001')
+        self.assertEqual(AuditLog.objects.count(), 1)
+        flush_buffer(token)
+        self.assertEqual(AuditLog.objects.count(), 2)
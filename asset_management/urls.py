@@ -35,7 +35,7 @@ urlpatterns = [
 
 
     # QR Code features
-    path('assets/<int:pk>/qr/', views.generate_asset_qr, name='generate_qr'),
+    path('assets/<int:pk>/qr.png', views.asset_qr_png, name='asset_qr'),
     path('assets/<int:pk>/qr/print/', views.print_asset_qr, name='print_qr'),
     path('qr-scanner/', views.qr_scanner_view, name='qr_scanner'),
     path('qr-lookup/', views.qr_lookup, name='qr_lookup'),
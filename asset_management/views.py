@@ -2,6 +2,8 @@
 AMATS Views - Access Management and Asset Tracking System
 Implements role-based access control and audit logging
 """
+import csv
+import hashlib
 import json
 from datetime import timedelta
 from django.shortcuts import render, get_object_or_404, redirect
@@ -12,14 +14,21 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.views import View
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db import transaction
+from django.db.models import Prefetch, Q
 from django.utils import timezone
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.core.paginator import Paginator
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 from django.conf import settings
 
-from .models import Asset, AssetAssignment, AssetCategory, UserProfile, AuditLog, MaintenanceRecord
+from .audit import LazyAudit, record_audit
+from .dashboard import dashboard_category_stats, dashboard_stats, invalidate_dashboard_stats
+from .pagination import CountlessPaginator, KeysetPaginationMixin, PKSlicePaginator
+from .models import (
+    Asset, AssetAssignment, UserProfile, AuditLog, MaintenanceRecord,
+)
 from .forms import (
     LoginForm, AssetForm, AssetIssueForm, AssetReturnForm, 
     AssetFilterForm, UserProfileForm, MaintenanceRecordForm, NetworkScanForm
@@ -30,14 +39,23 @@ from .forms import (
 def log_audit_action(user, action, description, model_name=None, object_id=None, request=None):
     """Create audit log entry"""
     ip = request.META.get('REMOTE_ADDR') if request else None
-    AuditLog.objects.create(
-        user=user,
-        action=action,
-        description=description,
-        model_name=model_name,
-        object_id=str(object_id) if object_id else None,
-        ip_address=ip
-    )
+    record_audit(user, action, description, model_name=model_name, object_id=object_id, ip_address=ip)
+
+
+class RelatedFieldsMixin:
+    """
+    Apply the view's declared ``related_fields`` to its queryset:
+    ``{'select': [...], 'prefetch': [...]}`` listing what the template touches.
+    """
+    related_fields = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.related_fields.get('select'):
+            queryset = queryset.select_related(*self.related_fields['select'])
+        if self.related_fields.get('prefetch'):
+            queryset = queryset.prefetch_related(*self.related_fields['prefetch'])
+        return queryset
 
 
 def login_view(request):
@@ -47,7 +65,7 @@ def login_view(request):
         if form.is_valid():
             user = form.get_user()
             login(request, user)
-            log_audit_action(user, 'LOGIN', f'User {user.username} logged in', request=request)
+            log_audit_action(user, 'LOGIN', LazyAudit('User %s logged in', user.username), request=request)
             messages.success(request, f'Welcome back, {user.get_full_name() or user.username}!')
             return redirect('dashboard')
         else:
@@ -61,7 +79,7 @@ def login_view(request):
 def logout_view(request):
     """Custom logout with audit logging"""
     if request.user.is_authenticated:
-        log_audit_action(request.user, 'LOGOUT', f'User {request.user.username} logged out', request=request)
+        log_audit_action(request.user, 'LOGOUT', LazyAudit('User %s logged out', request.user.username), request=request)
     logout(request)
     messages.info(request, 'You have been logged out successfully.')
     return redirect('login')
@@ -70,12 +88,8 @@ def logout_view(request):
 class DashboardView(LoginRequiredMixin, View):
     """Main dashboard with statistics and alerts"""
     def get(self, request):
-        # Statistics
-        total_assets = Asset.objects.count()
-        available_assets = Asset.objects.filter(status='AVAILABLE').count()
-        assigned_assets = Asset.objects.filter(status='ASSIGNED').count()
-        missing_assets = Asset.objects.filter(status='MISSING').count()
-        maintenance_assets = Asset.objects.filter(status='MAINTENANCE').count()
+        # Statistics (cached; see dashboard.py)
+        stats = dashboard_stats()
 
         # Recent activities
         recent_assignments = AssetAssignment.objects.select_related('asset', 'assigned_to').all()[:10]
@@ -91,25 +105,17 @@ class DashboardView(LoginRequiredMixin, View):
         ).select_related('assigned_to')
 
         # Category breakdown
-        category_stats = AssetCategory.objects.annotate(
-            asset_count=Count('assets')
-        ).values('name', 'asset_count')
+        category_stats = dashboard_category_stats()
 
         # Recent audit logs
         recent_logs = AuditLog.objects.select_related('user').all()[:15]
 
         context = {
-            'stats': {
-                'total': total_assets,
-                'available': available_assets,
-                'assigned': assigned_assets,
-                'missing': missing_assets,
-                'maintenance': maintenance_assets,
-            },
+            'stats': stats,
             'recent_assignments': recent_assignments,
             'overdue_assignments': overdue_assignments,
             'attention_needed': attention_needed,
-            'category_stats': list(category_stats),
+            'category_stats': category_stats,
             'recent_logs': recent_logs,
             'notifications': [],
             'unread_notifications_count': 0,
@@ -117,9 +123,11 @@ class DashboardView(LoginRequiredMixin, View):
         # Fetch unread notifications for user
         try:
             from .models import Notification
-            user_notifications = Notification.objects.filter(user=request.user, is_read=False)[:10]
-            context['notifications'] = user_notifications
-            context['unread_notifications_count'] = user_notifications.count()
+            unread = Notification.objects.filter(user=request.user, is_read=False)
+            unread_count = unread.count()
+            # Most recent ten; no SELECT at all when nothing is unread
+            context['notifications'] = list(unread.order_by('-timestamp')[:10]) if unread_count else []
+            context['unread_notifications_count'] = unread_count
         except Exception:
             context['notifications'] = []
             context['unread_notifications_count'] = 0
@@ -162,15 +170,20 @@ def mark_notification_read(request, pk):
         return JsonResponse({'status': 'not_found'}, status=404)
 
 
-class AssetListView(LoginRequiredMixin, ListView):
+class AssetListView(LoginRequiredMixin, RelatedFieldsMixin, KeysetPaginationMixin, ListView):
     """Asset list with filtering"""
     model = Asset
     template_name = 'asset_management/asset_list.html'
     context_object_name = 'assets'
     paginate_by = 20
+    related_fields = {'select': ['category']}
+    # ?page=N jumps fetch one extra row instead of running COUNT(*)
+    paginator_class = CountlessPaginator
+    # Columns asset_list.html renders (plus the keyset cursor); everything else stays deferred
+    list_fields = ('id', 'asset_tag', 'name', 'status', 'condition', 'created_at', 'category__name')
 
     def get_queryset(self):
-        queryset = Asset.objects.select_related('category', 'assigned_to').all()
+        queryset = super().get_queryset().only(*self.list_fields)
 
         # Apply filters
         form = AssetFilterForm(self.request.GET)
@@ -202,26 +215,29 @@ class AssetListView(LoginRequiredMixin, ListView):
         return context
 
 
-class AssetDetailView(LoginRequiredMixin, DetailView):
+class AssetDetailView(LoginRequiredMixin, RelatedFieldsMixin, DetailView):
     """Detailed asset view with assignment history"""
     model = Asset
     template_name = 'asset_management/asset_detail.html'
     context_object_name = 'asset'
+    related_fields = {
+        'select': ['category', 'assigned_to'],
+        'prefetch': [Prefetch(
+            'assignments',
+            queryset=AssetAssignment.objects.select_related('assigned_to', 'assigned_by').order_by('-date_out'),
+        )],
+    }
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        asset = self.get_object()
         
-        # Get assignment history
-        assignments = AssetAssignment.objects.filter(
-            asset=asset
-        ).select_related('assigned_to', 'assigned_by').order_by('-date_out')
+        # Get assignment history (prefetched with the asset)
+        assignments = list(self.object.assignments.all())
         
         context['assignment_history'] = assignments
         
         # Find active assignment (not returned)
-        active_assignment = assignments.filter(date_returned__isnull=True).first()
-        context['active_assignment'] = active_assignment
+        context['active_assignment'] = next((a for a in assignments if a.date_returned is None), None)
         
         return context
 
@@ -241,7 +257,7 @@ class AssetCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         response = super().form_valid(form)
         log_audit_action(
             self.request.user, 'CREATE', 
-            f'Created asset {form.instance.asset_tag}',
+            LazyAudit('Created asset %s', form.instance.asset_tag),
             'Asset', form.instance.id,
             self.request
         )
@@ -260,7 +276,7 @@ class AssetUpdateView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         log_audit_action(
             self.request.user, 'UPDATE',
-            f'Updated asset {form.instance.asset_tag}',
+            LazyAudit('Updated asset %s', form.instance.asset_tag),
             'Asset', form.instance.id,
             self.request
         )
@@ -281,7 +297,7 @@ class AssetDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         asset = self.get_object()
         log_audit_action(
             request.user, 'DELETE',
-            f'Deleted asset {asset.asset_tag}',
+            LazyAudit('Deleted asset %s', asset.asset_tag),
             'Asset', asset.id,
             request
         )
@@ -306,17 +322,24 @@ def issue_asset(request, pk):
             assignment.assigned_by = request.user
             assignment.assignment_type = 'ISSUE'
             assignment.checkout_ip = request.META.get('REMOTE_ADDR')
-            assignment.save()
 
-            # Update asset status
-            asset.status = 'ASSIGNED'
-            asset.assigned_to = assignment.assigned_to
-            asset.date_assigned = timezone.now()
-            asset.save()
+            # Claim the asset with one conditional UPDATE so two concurrent issues
+            # can't both pass the AVAILABLE check above
+            now = timezone.now()
+            with transaction.atomic():
+                claimed = Asset.objects.filter(pk=asset.pk, status='AVAILABLE').update(
+                    status='ASSIGNED', assigned_to=assignment.assigned_to, date_assigned=now, updated_at=now,
+                )
+                if claimed:
+                    assignment.save()
+            if not claimed:
+                messages.error(request, 'This asset is not available for issue.')
+                return redirect('asset_detail', pk=pk)
+            invalidate_dashboard_stats()
 
             log_audit_action(
                 request.user, 'ISSUE',
-                f'Issued {asset.asset_tag} to {assignment.assigned_to.username}',
+                LazyAudit('Issued %s to %s', asset.asset_tag, assignment.assigned_to),
                 'AssetAssignment', assignment.id,
                 request
             )
@@ -347,19 +370,28 @@ def return_asset(request, assignment_id):
         form = AssetReturnForm(request.POST, instance=assignment)
         if form.is_valid():
             assignment = form.save(commit=False)
-            assignment.date_returned = timezone.now()
-            assignment.return_ip = request.META.get('REMOTE_ADDR')
-            assignment.save()
-            
-            # Update asset status
-            asset.status = 'AVAILABLE'
-            asset.assigned_to = None
-            asset.date_assigned = None
-            asset.save()
-            
+            now = timezone.now()
+            # Close the assignment only if it is still open, so a double submit
+            # (or two users returning at once) records a single return
+            with transaction.atomic():
+                closed = AssetAssignment.objects.filter(pk=assignment.pk, date_returned__isnull=True).update(
+                    date_returned=now,
+                    return_ip=request.META.get('REMOTE_ADDR'),
+                    condition_returned=assignment.condition_returned,
+                    notes=assignment.notes,
+                )
+                if closed:
+                    Asset.objects.filter(pk=asset.pk).update(
+                        status='AVAILABLE', assigned_to=None, date_assigned=None, updated_at=now,
+                    )
+            if not closed:
+                messages.error(request, 'No active assignment found for this asset. It may have already been returned.')
+                return redirect('asset_list')
+            invalidate_dashboard_stats()
+
             log_audit_action(
                 request.user, 'RETURN',
-                f'Returned {asset.asset_tag} from {assignment.assigned_to.username}',
+                LazyAudit('Returned %s from %s', asset.asset_tag, assignment.assigned_to),
                 'AssetAssignment', assignment.id,
                 request
             )
@@ -377,19 +409,23 @@ def return_asset(request, assignment_id):
 
 from django.contrib.auth.models import User
 
-class AuditLogListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class AuditLogListView(LoginRequiredMixin, UserPassesTestMixin, RelatedFieldsMixin, KeysetPaginationMixin, ListView):
     """View audit logs (Admin/Supervisor only)"""
     model = AuditLog
     template_name = 'asset_management/audit_log.html'
     context_object_name = 'logs'
     paginate_by = 50
+    keyset_field = 'timestamp'
+    related_fields = {'select': ['user']}
+    # ?page=N jumps skip over primary keys only instead of the wide log rows
+    paginator_class = PKSlicePaginator
 
     def test_func(self):
         profile = self.request.user.profile
         return profile.is_admin() or profile.role == 'SUPERVISOR' or self.request.user.is_superuser
 
     def get_queryset(self):
-        queryset = AuditLog.objects.select_related('user').all()
+        queryset = super().get_queryset()
 
         # Filter by action type if provided
         action = self.request.GET.get('action')
@@ -464,33 +500,30 @@ def network_scan_view(request):
             subnet = form.cleaned_data['subnet']
             timeout = form.cleaned_data['timeout']
 
-            # Import scanner module
-            from network_scanner.scanner import NetworkScanner
-
-            scanner = NetworkScanner(subnet, timeout)
-            scan_results = scanner.scan()
-
-            # Update asset network status
-            for result in scan_results:
-                if result['mac_address']:
-                    try:
-                        asset = Asset.objects.get(mac_address__iexact=result['mac_address'])
-                        asset.network_last_seen = timezone.now()
-                        asset.ip_address = result['ip_address']
-                        if asset.status == 'MISSING':
-                            asset.status = 'AVAILABLE'
-                            messages.warning(request, f'Found missing asset {asset.asset_tag} on network!')
-                        asset.save()
-                    except Asset.DoesNotExist:
-                        pass
+            if settings.NETWORK_SCAN_ASYNC:
+                # Scan on a worker; the user gets a Notification when it finishes
+                from .tasks import scan_subnet
+                scan_subnet.delay(subnet, timeout, request.user.pk, request.META.get('REMOTE_ADDR'))
+                messages.info(request, f'Network scan of {subnet} started. You will be notified when it completes.')
+            else:
+                # Import scanner module
+                from network_scanner.scanner import NetworkScanner, apply_scan_results
 
-            log_audit_action(
-                request.user, 'SCAN',
-                f'Network scan performed on {subnet}. Found {len(scan_results)} devices.',
-                request=request
-            )
+                scanner = NetworkScanner(subnet, timeout)
+                scan_results = scanner.scan()
+
+                # Update asset network status: one lookup for all MACs, one batched UPDATE
+                _, found_missing = apply_scan_results(scan_results)
+                for asset in found_missing:
+                    messages.warning(request, f'Found missing asset {asset.asset_tag} on network!')
+
+                log_audit_action(
+                    request.user, 'SCAN',
+                    LazyAudit('Network scan performed on %s. Found %d devices.', subnet, len(scan_results)),
+                    request=request
+                )
 
-            messages.success(request, f'Network scan completed. Found {len(scan_results)} devices.')
+                messages.success(request, f'Network scan completed. Found {len(scan_results)} devices.')
     else:
         form = NetworkScanForm()
 
@@ -500,6 +533,37 @@ def network_scan_view(request):
     })
 
 
+class _Echo:
+    """csv.writer target that hands each formatted line straight back"""
+
+    def write(self, value):
+        return value
+
+
+def _stream_csv(queryset, fields, filename):
+    """Stream ``fields`` of ``queryset`` as a CSV attachment, 2000 rows per fetch"""
+    writer = csv.writer(_Echo())
+
+    def rows():
+        yield writer.writerow(fields)
+        for row in queryset.values_list(*fields).iterator(chunk_size=2000):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+INVENTORY_REPORT_FIELDS = (
+    'asset_tag', 'name', 'category__name', 'status',
+    'condition', 'assigned_to__username', 'location',
+)
+ASSIGNMENTS_REPORT_FIELDS = (
+    'asset__asset_tag', 'assigned_to__username', 'assigned_by__username',
+    'date_out', 'date_returned', 'assignment_type',
+)
+
+
 @login_required
 def generate_report(request):
     """Generate CSV/JSON reports"""
@@ -507,87 +571,64 @@ def generate_report(request):
         report_type = request.POST.get('report_type')
 
         if report_type == 'inventory':
-            assets = Asset.objects.all().values(
-                'asset_tag', 'name', 'category__name', 'status', 
-                'condition', 'assigned_to__username', 'location'
-            )
-            import csv
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = 'attachment; filename="inventory_report.csv"'
-            writer = csv.DictWriter(response, fieldnames=assets[0].keys() if assets else [])
-            writer.writeheader()
-            for asset in assets:
-                writer.writerow(asset)
-
+            response = _stream_csv(Asset.objects.all(), INVENTORY_REPORT_FIELDS, 'inventory_report.csv')
             log_audit_action(request.user, 'EXPORT', 'Generated inventory report', request=request)
             return response
 
         elif report_type == 'assignments':
-            assignments = AssetAssignment.objects.all().values(
-                'asset__asset_tag', 'assigned_to__username', 'assigned_by__username',
-                'date_out', 'date_returned', 'assignment_type'
-            )
-            import csv
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = 'attachment; filename="assignments_report.csv"'
-            if assignments:
-                writer = csv.DictWriter(response, fieldnames=assignments[0].keys())
-                writer.writeheader()
-                for assignment in assignments:
-                    writer.writerow(assignment)
-            return response
+            return _stream_csv(AssetAssignment.objects.all(), ASSIGNMENTS_REPORT_FIELDS, 'assignments_report.csv')
 
     return render(request, 'asset_management/reports.html')
 
 
 def check_overdue_assets():
     """Utility to check and alert on overdue assets (can be run via cron)"""
-    from django.core.mail import send_mail
+    # Send notification (if email configured)
+    if not getattr(settings, 'EMAIL_HOST', ''):
+        return
 
     overdue = AssetAssignment.objects.filter(
         date_due__lt=timezone.now(),
         date_returned__isnull=True
-    )
+    ).select_related('asset', 'assigned_to', 'assigned_by')
 
-    for assignment in overdue:
-        # Send notification (if email configured)
-        if hasattr(settings, 'EMAIL_HOST') and settings.EMAIL_HOST:
-            send_mail(
+    # One SMTP connection (and TLS handshake) for the whole batch
+    with get_connection(fail_silently=True) as connection:
+        connection.send_messages([
+            EmailMessage(
                 subject=f'Overdue Asset Alert: {assignment.asset.asset_tag}',
-                message=f'Asset {assignment.asset.name} ({assignment.asset.asset_tag}) is overdue. '
-                        f'Assigned to: {assignment.assigned_to.get_full_name()}',
+                body=f'Asset {assignment.asset.name} ({assignment.asset.asset_tag}) is overdue. '
+                     f'Assigned to: {assignment.assigned_to.get_full_name()}',
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[assignment.assigned_by.email],
-                fail_silently=True
+                to=[assignment.assigned_by.email],
+                connection=connection,
             )
-
+            for assignment in overdue
+            if assignment.assigned_by and assignment.assigned_by.email
+        ])
 
 
 @login_required
-def generate_asset_qr(request, pk):
-    """Generate QR code for asset"""
-    asset = get_object_or_404(Asset, pk=pk)
-    
-    if not asset.qr_code:
-        asset.generate_qr_code()
-        asset.save()
-        messages.success(request, f'QR code generated for {asset.asset_tag}')
-    
-    return redirect('asset_detail', pk=pk)
+def asset_qr_png(request, pk):
+    """Serve an asset's QR code PNG, rendered on demand from its tag and serial"""
+    asset = get_object_or_404(Asset.objects.only('id', 'asset_tag', 'serial_number'), pk=pk)
+    qr_data = asset.qr_data
+    # The image only changes with the payload, so it doubles as the validator
+    etag = '"%s"' % hashlib.sha1(qr_data.encode()).hexdigest()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(asset.qr_code_png(), content_type='image/png')
+        if request.GET.get('download'):
+            response['Content-Disposition'] = f'attachment; filename="qr_{asset.asset_tag.replace("-", "_")}.png"'
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=86400)
+    return response
 
 
 @login_required
 def print_asset_qr(request, pk):
     """Render a print-friendly QR label for an asset."""
     asset = get_object_or_404(Asset, pk=pk)
-    # Ensure QR exists
-    if not asset.qr_code:
-        try:
-            asset.generate_qr_code()
-            asset.save()
-        except Exception:
-            pass
-
     return render(request, 'asset_management/print_qr.html', {
         'asset': asset
     })
@@ -610,11 +651,11 @@ def qr_lookup(request):
             parts = qr_data.split('|')
             if len(parts) >= 2:
                 asset_tag = parts[1]
-                try:
-                    asset = Asset.objects.get(asset_tag=asset_tag)
-                    return redirect('asset_detail', pk=asset.pk)
-                except Asset.DoesNotExist:
-                    messages.error(request, f'Asset {asset_tag} not found')
+                # Only the pk is needed for the redirect
+                asset_pk = Asset.objects.filter(asset_tag=asset_tag).values_list('pk', flat=True).first()
+                if asset_pk is not None:
+                    return redirect('asset_detail', pk=asset_pk)
+                messages.error(request, f'Asset {asset_tag} not found')
             else:
                 messages.error(request, 'Invalid QR code format')
         except Exception as e:
@@ -638,29 +679,25 @@ def scan_add_asset(request):
                 asset_tag = parts[1]
                 serial_number = parts[2] if len(parts) > 2 else ''
                 
-                # Check if asset already exists
-                if Asset.objects.filter(asset_tag=asset_tag).exists():
-                    messages.warning(request, f'Asset {asset_tag} already exists!')
-                    return redirect('asset_detail', pk=Asset.objects.get(asset_tag=asset_tag).pk)
-                
-                # Create new asset with scanned data
-                asset = Asset(
+                # Create new asset with scanned data; get_or_create runs the INSERT in a
+                # savepoint and falls back to the existing row if a concurrent scan won
+                asset, created = Asset.objects.only('pk').get_or_create(
                     asset_tag=asset_tag,
-                    name=f'Scanned Asset {asset_tag}',  # Default name
-                    serial_number=serial_number if serial_number != 'N/A' else '',
-                    status='AVAILABLE',
-                    condition='GOOD',
-                    created_by=request.user
+                    defaults={
+                        'name': f'Scanned Asset {asset_tag}',  # Default name
+                        'serial_number': serial_number if serial_number != 'N/A' else '',
+                        'status': 'AVAILABLE',
+                        'condition': 'GOOD',
+                        'created_by': request.user,
+                    },
                 )
-                asset.save()
-                
-                # Generate QR code
-                asset.generate_qr_code()
-                asset.save()
-                
+                if not created:
+                    messages.warning(request, f'Asset {asset_tag} already exists!')
+                    return redirect('asset_detail', pk=asset.pk)
+
                 log_audit_action(
                     request.user, 'CREATE',
-                    f'Created asset {asset.asset_tag} via QR scan',
+                    LazyAudit('Created asset %s via QR scan', asset.asset_tag),
                     'Asset', asset.id,
                     request
                 )
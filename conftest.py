@@ -0,0 +1,55 @@
+"""
+Shared pytest fixtures for AMATS
+Seed rows are inserted once per session with bulk_create; each test runs in
+its own rolled-back transaction, so tests may mutate them freely.
+"""
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from asset_management.models import Asset, AssetCategory, UserProfile
+
+SEED_PASSWORD = 'pass'
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        if User.objects.filter(username='fixture_admin').exists():  # --reuse-db
+            return
+        # Hash once and share it; bulk_create skips the post_save profile signal
+        password = make_password(SEED_PASSWORD)
+        users = User.objects.bulk_create([
+            User(username='fixture_admin', email='admin@example.com', password=password,
+                 is_staff=True, is_superuser=True),
+            User(username='fixture_tech', email='tech@example.com', password=password),
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(user=users[0], role='ADMIN', employee_id=f'UTV-{users[0].id:04d}'),
+            UserProfile(user=users[1], role='TECH', employee_id=f'UTV-{users[1].id:04d}'),
+        ])
+        category = AssetCategory.objects.create(name='Fixture Equipment')
+        Asset.objects.bulk_create([
+            Asset(asset_tag=f'FIX-{n:04d}', name=f'Fixture Asset {n}', category=category, created_by=users[0])
+            for n in range(1, 4)
+        ], batch_size=500)
+
+
+@pytest.fixture
+def seed_admin(db):
+    return User.objects.get(username='fixture_admin')
+
+
+@pytest.fixture
+def seed_tech(db):
+    return User.objects.get(username='fixture_tech')
+
+
+@pytest.fixture
+def seed_category(db):
+    return AssetCategory.objects.get(name='Fixture Equipment')
+
+
+@pytest.fixture
+def seed_asset(db):
+    return Asset.objects.get(asset_tag='FIX-0001')
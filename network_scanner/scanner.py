@@ -5,161 +5,486 @@ Features:
 - Ping sweep for host discovery
 - Integration with Django Asset model
 """
+import asyncio
+import logging
+import os
+import select
 import subprocess
 import re
 import platform
 import socket
-from typing import List, Dict, Optional
-from ipaddress import ip_network
+import struct
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import List, Dict, Optional, Set, Tuple
+from ipaddress import ip_address, ip_network
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+_IS_WINDOWS = platform.system().lower() == 'windows'
+# (count flag, timeout flag) for ping; Windows takes the timeout in milliseconds
+_PING_ARGS_WIN = ('-n', '-w')
+_PING_ARGS_NIX = ('-c', '-W')
+# Ports tried by the TCP probe; a refused connection still proves the host is up
+_TCP_PROBE_PORTS = (22, 80, 443, 445)
+PROBE_MODES = ('icmp', 'tcp', 'both', 'arp')
+_ETH_P_ARP = 0x0806
+_BROADCAST_MAC = b'\xff' * 6
+# Seconds to wait before re-reading the ARP table when live hosts are missing from it
+_ARP_SETTLE_DELAY = 0.05
+# An unchanged sighting only rewrites network_last_seen once it is this stale
+LAST_SEEN_WRITE_INTERVAL = timedelta(minutes=5)
+
+# ARP output patterns, matched against lower-cased text
+# "192.168.1.1 dev eth0 lladdr 00:11:22:33:44:55 REACHABLE"
+_IP_NEIGH_LINE = re.compile(r'^(\S+) .*?lladdr ([0-9a-f]{2}(?::[0-9a-f]{2}){5})', re.M)
+# arp -a / arp -an: an IPv4 address followed by a MAC (":" or Windows "-") on the same line
+_ARP_LINE = re.compile(r'^\D*?(\d{1,3}(?:\.\d{1,3}){3})\D.*?([0-9a-f]{2}(?:[:-][0-9a-f]{2}){5})', re.M)
+
+
+@dataclass(slots=True)
+class ScanResult:
+    """One live host found by a scan; the asset_* fields are filled in by apply_scan_results"""
+    ip_address: str
+    mac_address: Optional[str]
+    is_alive: bool = True
+    asset_found: bool = False
+    asset_id: Optional[int] = None
+    asset_tag: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """Plain dict, for JSON/serialization boundaries"""
+        return asdict(self)
 
 
 class NetworkScanner:
     """Network scanner to detect devices and match with registered assets"""
 
-    def __init__(self, subnet: str, timeout: int = 1):
+    def __init__(self, subnet: str, timeout: int = 1, max_workers: int = 64, max_hosts: int = 254,
+                 probe_mode: str = 'icmp'):
         """
         Initialize scanner
         Args:
             subnet: CIDR notation subnet (e.g., '192.168.1.0/24')
             timeout: Timeout in seconds for each host
+            max_workers: Number of hosts probed concurrently
+            max_hosts: Scan at most this many hosts from the start of the subnet
+            probe_mode: 'icmp' (ping), 'tcp' (connect to common ports, for networks
+                that filter ICMP), 'both' (TCP for hosts that didn't answer a ping)
+                or 'arp' (raw layer-2 ARP sweep of a directly attached subnet;
+                Linux with CAP_NET_RAW, falls back to 'icmp' otherwise)
         """
+        if probe_mode not in PROBE_MODES:
+            raise ValueError(f'probe_mode must be one of {PROBE_MODES}')
         self.subnet = subnet
         self.timeout = timeout
+        self.max_workers = max_workers
+        self.max_hosts = max_hosts
+        self.probe_mode = probe_mode
         self.results = []
 
-    def scan(self) -> List[Dict]:
+    def scan(self) -> List[ScanResult]:
         """
         Perform network scan
         Returns:
-            List of dictionaries containing scan results
+            List of ScanResult records, in host order
         """
         try:
             network = ip_network(self.subnet, strict=False)
-            hosts = list(network.hosts())[:254]  # Limit to first 254 hosts for performance
-
-            results = []
-            for host in hosts:
-                ip = str(host)
-                result = self._scan_host(ip)
-                if result:
-                    results.append(result)
+        except ValueError as e:
+            logger.warning('Not scanning invalid subnet %r: %s', self.subnet, e)
+            return []
 
-            return results
-        except Exception as e:
-            print(f"Scan error: {e}")
+        # Limit to the first max_hosts hosts for performance; islice stops the
+        # generator there instead of building every address of a large prefix
+        ips = [str(host) for host in islice(network.hosts(), self.max_hosts)]
+        if not ips:
             return []
+        # Probe failures are handled per host; anything else is a bug and propagates
+        return asyncio.run(self._scan_async(ips))
+
+    async def _scan_async(self, ips: List[str]) -> List[ScanResult]:
+        """Probe every host concurrently on one event loop"""
+        if self.probe_mode == 'arp':
+            # Discovery and MAC resolution in one layer-2 pass, no subprocesses
+            arp_table = self._arp_sweep(ips)
+            if arp_table is not None:
+                return [self._scan_host(ip, arp_table) for ip in ips if ip in arp_table]
+
+        alive = set()
+        if self.probe_mode in ('icmp', 'both', 'arp'):
+            alive = await self._icmp_sweep(ips)
+        if self.probe_mode in ('tcp', 'both'):
+            alive |= await self._tcp_sweep([ip for ip in ips if ip not in alive])
+
+        # The probes have just filled the neighbour cache; read it once for every host
+        arp_table = await self._load_arp_table()
+        if any(ip not in arp_table for ip in alive):
+            # Replies can beat the kernel's neighbour resolution; give pending
+            # entries a moment and re-read the table once (not once per host)
+            await asyncio.sleep(_ARP_SETTLE_DELAY)
+            arp_table.update(await self._load_arp_table())
+        # Results stay in host order
+        return [self._scan_host(ip, arp_table) for ip in ips if ip in alive]
+
+    async def _probe_all(self, ips: List[str], probe) -> Set[str]:
+        """Run ``probe(ip)`` for every host, at most max_workers at a time"""
+        # Probes are I/O-bound, so overlap them; the semaphore caps how many
+        # child processes / sockets (and fds) are open at once
+        limit = asyncio.Semaphore(max(1, self.max_workers))
+
+        async def bounded(ip):
+            async with limit:
+                return await probe(ip)
+
+        replies = await asyncio.gather(*(bounded(ip) for ip in ips), return_exceptions=True)
+        return {ip for ip, reply in zip(ips, replies) if reply is True}
+
+    async def _icmp_sweep(self, ips: List[str]) -> Set[str]:
+        """Hosts answering an ICMP echo"""
+        # One socket sweep answers "who is up" for the whole subnet; the
+        # per-host ping subprocess is only the fallback when no ICMP socket
+        # can be opened. Nothing else runs on the loop yet, so blocking is fine.
+        alive = self._ping_sweep(ips)
+        if alive is None:
+            alive = await self._probe_all(ips, self._ping_host)
+        return alive
+
+    async def _tcp_sweep(self, ips: List[str]) -> Set[str]:
+        """Hosts answering (or refusing) a TCP connection on a common port"""
+        return await self._probe_all(ips, self._tcp_probe)
+
+    async def _tcp_probe(self, ip: str, ports=_TCP_PROBE_PORTS) -> bool:
+        """Try every port at once; a connection or an RST both mean the host is up"""
+        async def connect(port):
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=self.timeout)
+            except ConnectionRefusedError:
+                return True
+            except (OSError, asyncio.TimeoutError):
+                return False
+            writer.close()
+            return True
+
+        return any(await asyncio.gather(*(connect(port) for port in ports)))
+
+    def _scan_host(self, ip: str, arp_table: Dict[str, str]) -> ScanResult:
+        """Build the result for a live host"""
+        return ScanResult(ip_address=ip, mac_address=arp_table.get(ip))
+
+    @staticmethod
+    async def _run(args: List[str], timeout: float, capture: bool = False) -> Tuple[int, str]:
+        """Run a command without blocking the loop; returns (returncode, stdout)"""
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return proc.returncode, (stdout or b'').decode(errors='replace')
+
+    @staticmethod
+    def _open_icmp_socket() -> Optional[Tuple[socket.socket, bool]]:
+        """
+        Unprivileged ICMP datagram socket (Linux, gid within
+        net.ipv4.ping_group_range) or a raw socket when running as root.
+        Returns (socket, is_raw), or None if neither can be opened.
+        """
+        for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+            try:
+                return socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP), sock_type == socket.SOCK_RAW
+            except (OSError, AttributeError):
+                continue
+        return None
+
+    @staticmethod
+    def _icmp_checksum(data: bytes) -> int:
+        """16-bit one's-complement sum (RFC 1071)"""
+        if len(data) % 2:
+            data += b'\0'
+        total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+        total = (total >> 16) + (total & 0xFFFF)
+        total += total >> 16
+        return ~total & 0xFFFF
+
+    def _ping_sweep(self, ips: List[str]) -> Optional[Set[str]]:
+        """
+        Send one ICMP echo request to every host from a single socket and
+        collect replies until self.timeout expires. Returns the responding IPs,
+        or None when no ICMP socket is available.
+        """
+        opened = self._open_icmp_socket()
+        if opened is None:
+            return None
+        sock, is_raw = opened
+        ident = os.getpid() & 0xFFFF  # datagram sockets overwrite this with their port
+        seq_of = {}
+        alive = set()
+
+        with sock:
+            sock.setblocking(False)
+            try:
+                # Every reply lands at once; the default buffer drops about half of a /24
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            except OSError:
+                pass
+            for seq, ip in enumerate(ips):
+                seq &= 0xFFFF
+                header = struct.pack('!BBHHH', 8, 0, 0, ident, seq)
+                payload = b'AMATS'
+                packet = struct.pack('!BBHHH', 8, 0, self._icmp_checksum(header + payload), ident, seq) + payload
+                try:
+                    sock.sendto(packet, (ip, 0))
+                    seq_of[ip] = seq
+                except OSError:
+                    continue  # e.g. no route; the host just counts as down
+
+            deadline = time.monotonic() + self.timeout
+            while len(alive) < len(seq_of):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                    break
+                try:
+                    data, (addr, _) = sock.recvfrom(1024)
+                except OSError:
+                    continue
+                # Raw sockets (and BSD datagram ones) hand back the IP header too
+                if data and data[0] >> 4 == 4:
+                    data = data[(data[0] & 0x0F) * 4:]
+                if len(data) < 8:
+                    continue
+                icmp_type, _, _, reply_ident, reply_seq = struct.unpack('!BBHHH', data[:8])
+                if icmp_type != 0 or seq_of.get(addr) != reply_seq:
+                    continue
+                if is_raw and reply_ident != ident:
+                    continue  # another process's ping
+                alive.add(addr)
+
+        return alive
+
+    @staticmethod
+    def _local_interface(target_ip: str) -> Optional[Tuple[str, bytes, bytes]]:
+        """
+        (interface name, MAC, IPv4) of the Ethernet interface target_ip is
+        directly attached to, or None if it is only reachable through a router
+        """
+        try:
+            # connect() on UDP sends nothing; it only picks the source address
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+                probe.connect((target_ip, 9))
+                source_ip = probe.getsockname()[0]
 
-    def _scan_host(self, ip: str) -> Optional[Dict]:
-        """Scan individual host"""
-        is_alive = self._ping_host(ip)
-
-        if is_alive:
-            mac = self._get_mac_address(ip)
-            return {
-                'ip_address': ip,
-                'mac_address': mac,
-                'is_alive': True,
-                'asset_found': False,
-                'asset_id': None,
-                'asset_tag': None
-            }
+            import fcntl  # Linux only, like AF_PACKET itself
+            SIOCGIFADDR, SIOCGIFNETMASK = 0x8915, 0x891b
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as ctl:
+                for _, name in socket.if_nameindex():
+                    request = struct.pack('256s', name.encode()[:15])
+                    try:
+                        address = socket.inet_ntoa(fcntl.ioctl(ctl.fileno(), SIOCGIFADDR, request)[20:24])
+                    except OSError:
+                        continue  # no IPv4 address on this interface
+                    if address != source_ip:
+                        continue
+                    netmask = socket.inet_ntoa(fcntl.ioctl(ctl.fileno(), SIOCGIFNETMASK, request)[20:24])
+                    if ip_address(target_ip) not in ip_network(f'{address}/{netmask}', strict=False):
+                        return None  # routed: ARP would only ever reach the gateway
+                    with open(f'/sys/class/net/{name}/address') as f:
+                        mac = bytes.fromhex(f.read().strip().replace(':', ''))
+                    if not any(mac):
+                        return None  # loopback and other non-Ethernet links
+                    return name, mac, socket.inet_aton(source_ip)
+        except (OSError, ImportError, ValueError):
+            pass
         return None
 
-    def _ping_host(self, ip: str) -> bool:
+    def _arp_sweep(self, ips: List[str]) -> Optional[Dict[str, str]]:
+        """
+        Broadcast an ARP request for every host from one AF_PACKET socket and
+        collect replies until self.timeout expires. Returns {ip: MAC} for the
+        hosts that answered, or None when raw layer-2 access isn't available
+        or the subnet isn't directly attached.
+        """
+        if not ips or not hasattr(socket, 'AF_PACKET'):
+            return None
+        interface = self._local_interface(ips[0])
+        if interface is None:
+            return None
+        name, src_mac, src_ip = interface
+        try:
+            sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(_ETH_P_ARP))
+        except OSError:
+            return None  # needs root / CAP_NET_RAW
+
+        wanted = {socket.inet_aton(ip): ip for ip in ips}
+        found = {}
+        with sock:
+            try:
+                sock.bind((name, _ETH_P_ARP))
+            except OSError:
+                return None  # interface went away or is down
+            sock.setblocking(False)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            except OSError:
+                pass
+
+            ethernet = struct.pack('!6s6sH', _BROADCAST_MAC, src_mac, _ETH_P_ARP)
+            for target in wanted:
+                # htype Ethernet, ptype IPv4, hlen 6, plen 4, op request
+                arp = struct.pack('!HHBBH6s4s6s4s', 1, 0x0800, 6, 4, 1, src_mac, src_ip, b'\0' * 6, target)
+                try:
+                    sock.send(ethernet + arp)
+                except OSError:
+                    continue
+
+            deadline = time.monotonic() + self.timeout
+            while len(found) < len(wanted):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                    break
+                try:
+                    frame = sock.recv(128)
+                except OSError:
+                    continue
+                if len(frame) < 42:
+                    continue
+                op, sender_mac, sender_ip = struct.unpack('!6xH6s4s', frame[14:32])
+                if op == 2 and sender_ip in wanted:
+                    found[wanted[sender_ip]] = ':'.join(f'{b:02x}' for b in sender_mac)
+
+        return found
+
+    async def _ping_host(self, ip: str) -> bool:
         """Ping host to check if alive"""
         try:
-            param = '-n' if platform.system().lower() == 'windows' else '-c'
-            timeout_param = '-w' if platform.system().lower() == 'windows' else '-W'
-            timeout_val = str(self.timeout * 1000) if platform.system().lower() == 'windows' else str(self.timeout)
-            count = '1'
-
-            result = subprocess.run(
-                ['ping', param, count, timeout_param, timeout_val, ip],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+            count_flag, timeout_flag = _PING_ARGS_WIN if _IS_WINDOWS else _PING_ARGS_NIX
+            timeout_val = str(self.timeout * 1000) if _IS_WINDOWS else str(self.timeout)
+
+            returncode, _ = await self._run(
+                ['ping', count_flag, '1', timeout_flag, timeout_val, ip],
                 timeout=self.timeout + 2
             )
-            return result.returncode == 0
-        except:
+            return returncode == 0
+        except Exception:
             return False
 
-    def _get_mac_address(self, ip: str) -> Optional[str]:
-        """Get MAC address from ARP table"""
+    async def _load_arp_table(self) -> Dict[str, str]:
+        """Dump the whole ARP/neighbour cache with one command, as {ip: MAC}"""
         try:
-            system = platform.system().lower()
-
-            if system == 'windows':
-                result = subprocess.run(['arp', '-a', ip], capture_output=True, text=True, timeout=5)
-                output = result.stdout
-                # Parse Windows ARP output
-                match = re.search(r'([0-9A-Fa-f]{2}-[0-9A-Fa-f]{2}-[0-9A-Fa-f]{2}-[0-9A-Fa-f]{2}-[0-9A-Fa-f]{2}-[0-9A-Fa-f]{2})', output)
-                if match:
-                    return match.group(1).replace('-', ':').upper()
-            else:
-                # Linux/Mac - use ip neigh or arp
-                result = subprocess.run(['ip', 'neigh', 'show', ip], capture_output=True, text=True, timeout=5)
-                output = result.stdout
-
-                # Parse ip neigh output
-                match = re.search(r'lladdr ([0-9a-f]{2}:[0-9a-f]{2}:[0-9a-f]{2}:[0-9a-f]{2}:[0-9a-f]{2}:[0-9a-f]{2})', output.lower())
-                if match:
-                    return match.group(1).upper()
-
-                # Fallback to arp command
-                result = subprocess.run(['arp', '-n', ip], capture_output=True, text=True, timeout=5)
-                output = result.stdout
-                match = re.search(r'([0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2})', output)
-                if match:
-                    return match.group(1).upper()
+            if _IS_WINDOWS:
+                _, output = await self._run(['arp', '-a'], timeout=5, capture=True)
+                return _parse_arp_output(output, _ARP_LINE)
+
+            # Linux - ip neigh; fall back to arp (net-tools, Mac)
+            try:
+                _, output = await self._run(['ip', 'neigh', 'show'], timeout=5, capture=True)
+                table = _parse_arp_output(output, _IP_NEIGH_LINE)
+                if table:
+                    return table
+            except OSError:
+                pass
+            _, output = await self._run(['arp', '-an'], timeout=5, capture=True)
+            return _parse_arp_output(output, _ARP_LINE)
 
         except Exception as e:
-            print(f"Error getting MAC for {ip}: {e}")
-        return None
+            logger.debug('Error reading ARP table: %s', e)
+        return {}
 
 
-def scan_and_update_assets(subnet: str = '192.168.1.0/24') -> Dict:
+def _parse_arp_output(output: str, pattern) -> Dict[str, str]:
+    # Lowercase, colon-separated: the form Asset.mac_address is stored in
+    return {ip: mac.replace('-', ':') for ip, mac in pattern.findall(output.lower())}
+
+
+def apply_scan_results(results: List[ScanResult], missing_location: Optional[str] = None):
     """
-    Scan network and update asset records
-    To be called from Django management command or view
+    Record a scan's sightings on the matching assets with one lookup and one
+    batched UPDATE. Assets that were MISSING become AVAILABLE (and get
+    ``missing_location.format(ip=...)`` as their location when given). Assets
+    seen again at the same IP within LAST_SEEN_WRITE_INTERVAL are not rewritten.
+    Annotates matched results with asset_found/asset_id/asset_tag and returns
+    ``(matched_assets, found_missing_assets)``.
     """
+    from asset_management.dashboard import invalidate_dashboard_stats
     from asset_management.models import Asset
     from django.utils import timezone
 
-    scanner = NetworkScanner(subnet)
-    results = scanner.scan()
-
-    # Match with assets
-    matched = 0
-    found_missing = 0
+    # One lookup for all MACs, then dict membership per host; the scanner
+    # already reports MACs in the stored (normalized) form
+    macs = {r.mac_address for r in results if r.mac_address}
+    # Load only what the match reads and bulk_update writes back unchanged
+    # (status/location); a deferred field there would cost a query per asset
+    matches = Asset.objects.filter(mac_address__in=macs).only(
+        'id', 'asset_tag', 'mac_address', 'status', 'location', 'ip_address', 'network_last_seen'
+    )
+    existing = {asset.mac_address: asset for asset in matches}
+    now = timezone.now()
+    matched = []
+    found_missing = []
+    to_update = []
 
     for result in results:
-        if result['mac_address']:
-            try:
-                asset = Asset.objects.get(mac_address__iexact=result['mac_address'])
-                asset.network_last_seen = timezone.now()
+        if not result.mac_address:
+            continue
+        asset = existing.get(result.mac_address)
+        if asset is None:
+            continue
 
-                # If asset was missing, mark it found
-                if asset.status == 'MISSING':
-                    asset.status = 'AVAILABLE'
-                    asset.location = f"Detected on network: {result['ip_address']}"
-                    found_missing += 1
+        result.asset_found = True
+        result.asset_id = asset.id
+        result.asset_tag = asset.asset_tag
+        matched.append(asset)
 
-                asset.ip_address = result['ip_address']
-                asset.save()
+        # Steady state: same IP, recently seen, nothing to write
+        if (asset.status != 'MISSING' and asset.ip_address == result.ip_address
+                and asset.network_last_seen and now - asset.network_last_seen < LAST_SEEN_WRITE_INTERVAL):
+            continue
 
-                result['asset_found'] = True
-                result['asset_id'] = asset.id
-                result['asset_tag'] = asset.asset_tag
-                matched += 1
+        asset.network_last_seen = now
+        # bulk_update skips save(), so bump the auto_now field by hand
+        asset.updated_at = now
+        asset.ip_address = result.ip_address
 
-            except Asset.DoesNotExist:
-                pass
+        # If asset was missing, mark it found
+        if asset.status == 'MISSING':
+            asset.status = 'AVAILABLE'
+            if missing_location:
+                asset.location = missing_location.format(ip=result.ip_address)
+            found_missing.append(asset)
+        to_update.append(asset)
+
+    fields = ['network_last_seen', 'ip_address', 'status', 'updated_at']
+    if missing_location:
+        fields.append('location')
+    Asset.objects.bulk_update(to_update, fields, batch_size=500)
+    if found_missing:
+        # bulk_update sends no post_save, and MISSING -> AVAILABLE moves the status counts
+        invalidate_dashboard_stats()
+
+    return matched, found_missing
+
+
+def scan_and_update_assets(subnet: str = '192.168.1.0/24') -> Dict:
+    """
+    Scan network and update asset records
+    To be called from Django management command or view
+    """
+    scanner = NetworkScanner(subnet)
+    results = scanner.scan()
+    matched, found_missing = apply_scan_results(results, missing_location='Detected on network: {ip}')
 
     return {
         'scanned': len(results),
-        'matched': matched,
-        'missing_found': found_missing,
-        'results': results
+        'matched': len(matched),
+        'missing_found': len(found_missing),
+        'results': [result.to_dict() for result in results]
     }
 
 
@@ -174,4 +499,4 @@ if __name__ == '__main__':
 
     print(f"Found {len(results)} devices:")
     for r in results:
-        print(f"  {r['ip_address']} - {r['mac_address'] or 'No MAC'}")
+        print(f"  {r.ip_address} - {r.mac_address or 'No MAC'}")
@@ -11,7 +11,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'amats_project.settings')
 django.setup()
 
 from django.contrib.auth.models import User
-from asset_management.models import AssetCategory, Asset, UserProfile
+from asset_management.dashboard import invalidate_dashboard_stats
+from asset_management.models import AssetCategory, Asset, UserProfile, normalize_mac_address
 
 def setup_demo_data():
     """Create demonstration data"""
@@ -27,8 +28,11 @@ def setup_demo_data():
         ('Audio Equipment', 'Microphones, mixers, speakers'),
     ]
 
-    for name, desc in categories:
-        AssetCategory.objects.get_or_create(name=name, defaults={'description': desc})
+    # One INSERT; names that already exist are left as they are
+    AssetCategory.objects.bulk_create(
+        [AssetCategory(name=name, description=desc) for name, desc in categories],
+        ignore_conflicts=True,
+    )
     print(f"✓ Created {len(categories)} asset categories")
 
     # Create demo users if they don't exist
@@ -59,19 +63,23 @@ def setup_demo_data():
         ('UTV-STR-001', 'Video Storage Array', 'Storage Media', 'AVAILABLE', 'Synology NAS', '00:1A:2B:3C:4D:61'),
     ]
 
-    for tag, name, cat_name, status, model, mac in sample_assets:
-        category = AssetCategory.objects.get(name=cat_name)
-        Asset.objects.get_or_create(
+    categories_by_name = {c.name: c for c in AssetCategory.objects.filter(name__in=[n for n, _ in categories])}
+    created_by = User.objects.first()
+    # bulk_create skips save(), so normalize the MACs here; existing tags are skipped
+    Asset.objects.bulk_create([
+        Asset(
             asset_tag=tag,
-            defaults={
-                'name': name,
-                'category': category,
-                'status': status,
-                'model': model,
-                'mac_address': mac,
-                'created_by': User.objects.first(),
-            }
+            name=name,
+            category=categories_by_name[cat_name],
+            status=status,
+            model=model,
+            mac_address=normalize_mac_address(mac),
+            created_by=created_by,
         )
+        for tag, name, cat_name, status, model, mac in sample_assets
+    ], ignore_conflicts=True)
+    # No post_save signals were sent for the rows above
+    invalidate_dashboard_stats()
     print(f"✓ Created {len(sample_assets)} sample assets")
 
     print("\nSetup complete! You can now:")
@@ -1,20 +1,15 @@
 import pytest
 from rest_framework.test import APIClient
-from django.contrib.auth.models import User
-from asset_management.models import AssetCategory
+from asset_management.models import Asset
 
 @pytest.mark.django_db
-def test_api_create_asset():
+def test_api_create_asset(seed_admin, seed_category):
     client = APIClient()
-    # create admin user
-    admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='pass')
-    client.login(username='admin', password='pass')
-
-    category = AssetCategory.objects.create(name='Camera')
+    client.force_login(seed_admin)
 
     payload = {
         'name': 'Field Camera',
-        'category': category.id,
+        'category': seed_category.id,
         'serial_number': 'CAM-12345',
         'location': 'Studio 1'
     }
@@ -23,3 +18,19 @@ def test_api_create_asset():
     assert response.status_code in (200, 201)
     data = response.json()
     assert 'asset_tag' in data or data.get('name') == 'Field Camera'
+
+
+@pytest.mark.django_db
+def test_api_list_assets_is_cursor_paginated(seed_admin, seed_category):
+    client = APIClient()
+    client.force_login(seed_admin)
+
+    for i in range(3):
+        Asset.objects.create(name=f'Camera {i}', category=seed_category, created_by=seed_admin)
+
+    response = client.get('/api/assets/')
+    assert response.status_code == 200
+    data = response.json()
+    assert 'count' not in data
+    assert [a['name'] for a in data['results']][:3] == ['Camera 2', 'Camera 1', 'Camera 0']
+    assert data['next'] is None
@@ -0,0 +1,30 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+@pytest.mark.django_db
+def test_token_lookup_is_cached_and_invalidated_on_delete(seed_admin, monkeypatch):
+    monkeypatch.setattr('asset_management.api.authentication._cache_is_shared', lambda: True)
+    token = Token.objects.create(user=seed_admin)
+    key = token.key
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Token ' + key)
+
+    assert client.get('/api/categories/').status_code == 200
+    assert cache.get('authtoken:' + key) == seed_admin.pk
+    assert client.get('/api/categories/').status_code == 200
+
+    token.delete()
+    assert cache.get('authtoken:' + key) is None
+    assert client.get('/api/categories/').status_code in (401, 403)
+
+
+@pytest.mark.django_db
+def test_token_lookup_skips_per_process_cache(seed_admin):
+    token = Token.objects.create(user=seed_admin)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    assert client.get('/api/categories/').status_code == 200
+    assert cache.get('authtoken:' + token.key) is None
@@ -1,15 +1,12 @@
 import pytest
-from django.contrib.auth.models import User
-from asset_management.models import Asset, AssetCategory
+from asset_management.models import Asset
 
 @pytest.mark.django_db
-def test_asset_creation():
-    user = User.objects.create_user(username='tester', password='pass')
-    category = AssetCategory.objects.create(name='Laptop')
+def test_asset_creation(seed_tech, seed_category):
     asset = Asset.objects.create(
         asset_tag='UTV-LAP-0001',
         name='Test Laptop',
-        category=category,
-        created_by=user
+        category=seed_category,
+        created_by=seed_tech
     )
     assert str(asset).startswith('UTV-LAP-0001')
@@ -0,0 +1,60 @@
+from unittest import mock
+
+import pytest
+from django.contrib.messages import get_messages
+from django.utils import timezone
+
+from asset_management.forms import AssetIssueForm, AssetReturnForm
+from asset_management.models import Asset, AssetAssignment, AuditLog
+
+
+def _racing(form_class, concurrent_write):
+    """Patch form_class.is_valid so another request's write lands between the view's read and its UPDATE"""
+    original = form_class.is_valid
+
+    def is_valid(form):
+        concurrent_write()
+        return original(form)
+
+    return mock.patch.object(form_class, 'is_valid', is_valid)
+
+
+@pytest.mark.django_db
+def test_second_issue_of_claimed_asset_is_a_no_op(client, seed_admin, seed_tech, seed_asset):
+    client.force_login(seed_admin)
+
+    def claim():
+        Asset.objects.filter(pk=seed_asset.pk).update(status='ASSIGNED')
+
+    with _racing(AssetIssueForm, claim):
+        response = client.post(f'/assets/{seed_asset.pk}/issue/', {
+            'assigned_to': seed_tech.pk, 'purpose': 'Field work', 'condition_out': 'GOOD',
+        })
+
+    assert response.status_code == 302
+    assert [str(m) for m in get_messages(response.wsgi_request)] == ['This asset is not available for issue.']
+    assert not AssetAssignment.objects.filter(asset=seed_asset).exists()
+    assert not AuditLog.objects.filter(action='ISSUE').exists()
+
+
+@pytest.mark.django_db
+def test_second_return_of_closed_assignment_is_a_no_op(client, seed_admin, seed_tech, seed_asset):
+    assignment = AssetAssignment.objects.create(
+        asset=seed_asset, assigned_to=seed_tech, assigned_by=seed_admin, assignment_type='ISSUE',
+    )
+    returned_at = timezone.now()
+
+    def close():
+        AssetAssignment.objects.filter(pk=assignment.pk).update(date_returned=returned_at)
+
+    client.force_login(seed_admin)
+    with _racing(AssetReturnForm, close):
+        response = client.post(f'/assignments/{assignment.pk}/return/', {'condition_returned': 'GOOD'})
+
+    assert response.status_code == 302
+    assert [str(m) for m in get_messages(response.wsgi_request)] == [
+        'No active assignment found for this asset. It may have already been returned.'
+    ]
+    assert AssetAssignment.objects.get(pk=assignment.pk).date_returned == returned_at
+    assert AssetAssignment.objects.filter(asset=seed_asset).count() == 1
+    assert not AuditLog.objects.filter(action='RETURN').exists()
@@ -0,0 +1,53 @@
+import pytest
+from asset_management.models import AuditLog
+
+
+def _pks(response):
+    return [log.pk for log in response.context['logs']]
+
+
+@pytest.mark.django_db
+def test_audit_log_keyset_pages_round_trip(client, seed_admin):
+    AuditLog.objects.bulk_create([AuditLog(action='LOGIN', description=f'entry {i}') for i in range(120)])
+    client.force_login(seed_admin)
+
+    first = client.get('/audit-logs/')
+    assert 'previous_query' not in first.context
+    second = client.get('/audit-logs/?' + first.context['next_query'])
+    third = client.get('/audit-logs/?' + second.context['next_query'])
+    assert not set(_pks(first)) & set(_pks(second))
+
+    back = client.get('/audit-logs/?' + third.context['previous_query'])
+    assert _pks(back) == _pks(second)
+    back = client.get('/audit-logs/?' + back.context['previous_query'])
+    assert _pks(back) == _pks(first)
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_404(client, seed_admin):
+    client.force_login(seed_admin)
+    assert client.get('/assets/?after=garbage').status_code == 404
+
+
+@pytest.mark.django_db
+def test_audit_log_page_jump(client, seed_admin):
+    AuditLog.objects.bulk_create([AuditLog(action='LOGIN', description=f'entry {i}') for i in range(120)])
+    client.force_login(seed_admin)
+
+    first = client.get('/audit-logs/')
+    second = client.get('/audit-logs/?' + first.context['next_query'])
+    jumped = client.get('/audit-logs/?page=2')
+    assert _pks(jumped) == _pks(second)
+    assert jumped.context['previous_query'] == 'page=1'
+
+
+@pytest.mark.django_db
+def test_numbered_pages_skip_count(client, seed_admin, django_assert_num_queries):
+    AuditLog.objects.bulk_create([AuditLog(action='LOGIN', description=f'entry {i}') for i in range(60)])
+    client.force_login(seed_admin)
+
+    # session, user, one page fetch of per_page + 1 rows
+    with django_assert_num_queries(3):
+        last = client.get('/audit-logs/?page=2')
+    assert 'next_query' not in last.context
+    assert client.get('/audit-logs/?page=3').status_code == 404
@@ -0,0 +1,155 @@
+import struct
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from asset_management.models import Asset
+from network_scanner.scanner import (
+    _ARP_LINE, _IP_NEIGH_LINE, NetworkScanner, ScanResult, _parse_arp_output, apply_scan_results,
+)
+
+MAC = '00:11:22:aa:bb:cc'
+
+
+def _seen(seed_asset, status='AVAILABLE', ip='192.168.1.20', ago=timedelta(minutes=1)):
+    Asset.objects.filter(pk=seed_asset.pk).update(
+        mac_address=MAC, status=status, ip_address=ip, network_last_seen=timezone.now() - ago,
+    )
+
+
+@pytest.mark.django_db
+def test_steady_state_sighting_is_one_query(seed_asset, django_assert_num_queries):
+    _seen(seed_asset)
+    result = ScanResult(ip_address='192.168.1.20', mac_address=MAC)
+    with django_assert_num_queries(1):
+        matched, found_missing = apply_scan_results([result])
+    assert [a.pk for a in matched] == [seed_asset.pk]
+    assert found_missing == []
+    assert (result.asset_found, result.asset_id, result.asset_tag) == (True, seed_asset.pk, 'FIX-0001')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ip, ago', [
+    ('192.168.1.21', timedelta(minutes=1)),   # moved to a new address
+    ('192.168.1.20', timedelta(minutes=10)),  # network_last_seen is stale
+])
+def test_changed_or_stale_sighting_is_written(seed_asset, ip, ago):
+    _seen(seed_asset, ago=ago)
+    before = timezone.now()
+    apply_scan_results([ScanResult(ip_address=ip, mac_address=MAC)])
+    asset = Asset.objects.get(pk=seed_asset.pk)
+    assert asset.ip_address == ip
+    assert asset.network_last_seen >= before
+
+
+@pytest.mark.django_db
+def test_missing_asset_found_again(seed_asset):
+    _seen(seed_asset, status='MISSING')
+    with mock.patch('asset_management.dashboard.invalidate_dashboard_stats') as invalidate:
+        matched, found_missing = apply_scan_results(
+            [ScanResult(ip_address='192.168.1.20', mac_address=MAC)],
+            missing_location='Detected on network: {ip}',
+        )
+    invalidate.assert_called_once_with()
+    assert [a.pk for a in found_missing] == [seed_asset.pk]
+    asset = Asset.objects.get(pk=seed_asset.pk)
+    assert (asset.status, asset.location) == ('AVAILABLE', 'Detected on network: 192.168.1.20')
+
+
+def test_scan_result_to_dict():
+    assert ScanResult('10.0.0.1', None).to_dict() == {
+        'ip_address': '10.0.0.1', 'mac_address': None, 'is_alive': True,
+        'asset_found': False, 'asset_id': None, 'asset_tag': None,
+    }
+
+
+def test_parse_ip_neigh_output():
+    output = (
+        '192.168.1.1 dev eth0 lladdr 00:11:22:AA:BB:CC REACHABLE\n'
+        '192.168.1.7 dev eth0  FAILED\n'
+        '192.168.1.8 dev eth0 lladdr 00:11:22:33:44:55 STALE\n'
+    )
+    assert _parse_arp_output(output, _IP_NEIGH_LINE) == {
+        '192.168.1.1': '00:11:22:aa:bb:cc',
+        '192.168.1.8': '00:11:22:33:44:55',
+    }
+
+
+def test_parse_net_tools_arp_output():
+    output = (
+        '? (192.168.1.1) at 00:11:22:aa:bb:cc [ether] on eth0\n'
+        '? (192.168.1.9) at <incomplete> on eth0\n'
+    )
+    assert _parse_arp_output(output, _ARP_LINE) == {'192.168.1.1': '00:11:22:aa:bb:cc'}
+
+
+def test_parse_windows_arp_output():
+    output = (
+        '\r\nInterface: 192.168.1.100 --- 0x4\r\n'
+        '  Internet Address      Physical Address      Type\r\n'
+        '  192.168.1.1           00-11-22-AA-BB-CC     dynamic\r\n'
+        '  192.168.1.255         ff-ff-ff-ff-ff-ff     static\r\n'
+    )
+    assert _parse_arp_output(output, _ARP_LINE) == {
+        '192.168.1.1': '00:11:22:aa:bb:cc',
+        '192.168.1.255': 'ff:ff:ff:ff:ff:ff',
+    }
+
+
+def test_icmp_checksum_verifies_to_zero():
+    header = struct.pack('!BBHHH', 8, 0, 0, 0x1234, 7)
+    checksum = NetworkScanner._icmp_checksum(header + b'AMATS')
+    packet = struct.pack('!BBHHH', 8, 0, checksum, 0x1234, 7) + b'AMATS'
+    assert NetworkScanner._icmp_checksum(packet) == 0
+
+
+class _FakeIcmpSocket:
+    """Raw ICMP socket stand-in that answers echo requests from a script"""
+
+    def __init__(self, reply_for):
+        self.reply_for = reply_for
+        self.replies = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def setblocking(self, flag):
+        pass
+
+    def setsockopt(self, *args):
+        pass
+
+    def sendto(self, packet, address):
+        ip = address[0]
+        _, _, _, ident, seq = struct.unpack('!BBHHH', packet[:8])
+        reply = self.reply_for(ip, ident, seq)
+        if reply is not None:
+            # Raw sockets deliver the 20-byte IPv4 header in front of the ICMP message
+            self.replies.append((b'\x45' + b'\0' * 19 + reply, (ip, 0)))
+
+    def recvfrom(self, size):
+        return self.replies.pop(0)
+
+
+def test_ping_sweep_matches_replies_by_sequence_and_ident():
+    def reply_for(ip, ident, seq):
+        if ip == '10.0.0.1':
+            return struct.pack('!BBHHH', 0, 0, 0, ident, seq)          # echo reply
+        if ip == '10.0.0.2':
+            return struct.pack('!BBHHH', 0, 0, 0, ident, seq + 1)      # wrong sequence
+        if ip == '10.0.0.3':
+            return struct.pack('!BBHHH', 0, 0, 0, ident ^ 1, seq)      # another process
+        return None                                                   # 10.0.0.4 is down
+
+    sock = _FakeIcmpSocket(reply_for)
+    scanner = NetworkScanner('10.0.0.0/29', timeout=1)
+    with mock.patch.object(NetworkScanner, '_open_icmp_socket', return_value=(sock, True)), \
+            mock.patch('network_scanner.scanner.select.select',
+                       side_effect=lambda r, w, x, t: (r if sock.replies else [], [], [])):
+        alive = scanner._ping_sweep(['10.0.0.1', '10.0.0.2', '10.0.0.3', '10.0.0.4'])
+    assert alive == {'10.0.0.1'}